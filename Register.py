@@ -3,10 +3,8 @@ import tkinter.messagebox as tkmb
 import random
 import string
 import re
-import subprocess
-
-ctk.set_appearance_mode("system")
-ctk.set_default_color_theme("green")
+import hashlib
+from storage import get_repository
 
 def generate_password(length=12):
     lowercase = string.ascii_lowercase
@@ -24,14 +22,11 @@ def generate_password(length=12):
     )
     return ''.join(random.sample(password, len(password)))
 
-def open_registration_window(main_app):
-    main_app.withdraw()
-    register_window = ctk.CTkToplevel(main_app)
-    register_window.geometry("600x700")
-    register_window.title("Titans Fitness Club - Register")
-    register_window.geometry(f"{register_window.winfo_screenwidth()}x{register_window.winfo_screenheight()}+0+0")
+# Build the registration screen into the navigator's window
+def show_register(navigator):
+    navigator.set_title("Titans Fitness Club - Register")
 
-    frame = ctk.CTkFrame(register_window, corner_radius=15, fg_color="dark gray")
+    frame = ctk.CTkFrame(navigator.root, corner_radius=15, fg_color="dark gray")
     frame.pack(expand=True, fill="both", padx=20, pady=20)
 
     label_reg = ctk.CTkLabel(frame, text="Register", font=("Helvetica", 24, "bold"), text_color="black")
@@ -91,8 +86,9 @@ def open_registration_window(main_app):
         update_password_strength()
 
     def save_to_file(full_name, email, password):
-        with open("FitnessTrackerData.txt", "a") as file:
-            file.write(f"Full Name: {full_name}, Email: {email}, Password: {password}\n")
+        # Stored hashed, the way Login and the dashboard check it
+        hashed_password = hashlib.sha256(password.encode()).hexdigest()
+        get_repository().add_user(full_name, email, hashed_password)
         tkmb.showinfo(title="Data Saved", message="Your data has been saved successfully!")
 
     def register():
@@ -113,15 +109,10 @@ def open_registration_window(main_app):
         if password == confirm_password:
             save_to_file(full_name, email, password)
             tkmb.showinfo(title="Registration Successful", message=f"Welcome {full_name}! You've been registered.")
-            register_window.destroy()
-
-            # Save the email to a file for later tracking in login
-            with open('current_user.txt', 'w') as user_file:
-                user_file.write(f"{email}\n{password}\n")  # Save both email and password
 
-            # Use subprocess to launch Welcome.py with the email
-            print(f"Registering user with email: {email}")  # Debugging statement
-            subprocess.Popen(['python', 'welcome.py', email])  # Pass email to Welcome.py
+            # Same window and process; the email is all the next screens need
+            import welcome
+            navigator.show(welcome.show_welcome, email)
 
         else:
             tkmb.showerror(title="Registration Failed", message="Passwords do not match.")
@@ -131,5 +122,3 @@ def open_registration_window(main_app):
 
     register_button = ctk.CTkButton(frame, text="Register", command=register, width=200)
     register_button.pack(pady=20)
-
-    register_window.mainloop()
@@ -0,0 +1,168 @@
+import time
+import logging
+import threading
+import tkinter as tk
+from collections import deque
+from PIL import Image, ImageSequence, ImageTk
+from assets import open_asset
+
+# Decoded frames held ahead of playback; memory stays at this many frames however long the animation
+BUFFER_FRAMES = 12
+
+# GIFs often store 0 or 10 ms delays meaning "as fast as possible"; play those like browsers do
+DEFAULT_FRAME_MS = 100
+MIN_FRAME_MS = 20
+
+UNDERRUN_MS = 15
+
+
+class FrameRing:
+    """Bounded queue of decoded frames between the decoder thread and the Tk thread
+
+    put() blocks while the ring is full, so the decoder only runs as far
+    ahead of playback as the ring allows.
+    """
+
+    def __init__(self, capacity=BUFFER_FRAMES):
+        self.capacity = capacity
+        self.frames = deque()
+        self.condition = threading.Condition()
+        self.closed = False
+        self.finished = False
+
+    def put(self, frame):
+        """Add a frame, waiting for room; False once the ring is closed"""
+        with self.condition:
+            while len(self.frames) >= self.capacity and not self.closed:
+                self.condition.wait()
+            if self.closed:
+                return False
+            self.frames.append(frame)
+            return True
+
+    def peek(self):
+        with self.condition:
+            return self.frames[0] if self.frames else None
+
+    def pop(self):
+        with self.condition:
+            frame = self.frames.popleft() if self.frames else None
+            self.condition.notify()
+            return frame
+
+    def __len__(self):
+        with self.condition:
+            return len(self.frames)
+
+    def finish(self):
+        """The decoder has no more frames"""
+        with self.condition:
+            self.finished = True
+
+    def close(self):
+        """Stop the decoder and drop the buffered frames"""
+        with self.condition:
+            self.closed = True
+            self.frames.clear()
+            self.condition.notify_all()
+
+
+class AnimationPlayer:
+    """Plays an animated image (or shows a still one) in a label
+
+    Frames are decoded and resized on a background thread into a
+    FrameRing, and shown from an after() callback on the Tk thread. Each
+    frame is due a fixed time after the previous one on the monotonic
+    clock, so a busy UI makes playback skip frames whose turn has already
+    passed rather than fall behind. Playback stops when the label is
+    destroyed or stop() is called.
+    """
+
+    def __init__(self, label, path, size, buffer_frames=BUFFER_FRAMES):
+        self.label = label
+        self.path = path
+        self.size = tuple(size)
+        self.ring = FrameRing(buffer_frames)
+        self.photo = None
+        self.due = None
+        self.job = None
+        self.shown = 0
+        self.dropped = 0
+
+    def start(self):
+        threading.Thread(target=self.decode, name="animation-decode", daemon=True).start()
+        self.job = self.label.after(UNDERRUN_MS, self.tick)
+        return self
+
+    def stop(self):
+        self.ring.close()
+        if self.job is not None:
+            try:
+                self.label.after_cancel(self.job)
+            except tk.TclError:
+                pass
+            self.job = None
+
+    def decode(self):
+        """Runs on the decoder thread; loops animations until stopped"""
+        try:
+            while True:
+                frames = 0
+                with open_asset(self.path) as f, Image.open(f) as image:
+                    for frame in ImageSequence.Iterator(image):
+                        duration = frame.info.get("duration") or DEFAULT_FRAME_MS
+                        resized = frame.convert("RGBA").resize(self.size, Image.LANCZOS)
+                        if not self.ring.put((resized, max(duration, MIN_FRAME_MS) / 1000)):
+                            return
+                        frames += 1
+                if frames <= 1:
+                    break
+        except Exception as e:
+            logging.error(f"Error decoding animation {self.path}: {e}")
+        self.ring.finish()
+
+    def tick(self):
+        self.job = None
+        try:
+            if not self.label.winfo_exists():
+                self.stop()
+                return
+            now = time.monotonic()
+            while True:
+                frame = self.ring.peek()
+                if frame is None:
+                    if self.ring.finished:
+                        return
+                    # The decoder is behind; start the clock again from the next frame
+                    self.due = None
+                    self.job = self.label.after(UNDERRUN_MS, self.tick)
+                    return
+                if self.due is None:
+                    self.due = now
+                if now < self.due:
+                    self.job = self.label.after(max(1, int((self.due - now) * 1000)), self.tick)
+                    return
+                image, duration = self.ring.pop()
+                self.due += duration
+                if self.due <= now and len(self.ring):
+                    # This frame's turn is already over and the next is ready
+                    self.dropped += 1
+                    continue
+                self.show(image)
+        except tk.TclError:
+            # The label was destroyed between ticks
+            self.stop()
+
+    def show(self, image):
+        if self.photo is None:
+            self.photo = ImageTk.PhotoImage(image)
+            self.label.configure(image=self.photo)
+            self.label.image = self.photo  # Keep a reference!
+        else:
+            # Same Tk image, new pixels; the label doesn't need reconfiguring
+            self.photo.paste(image)
+        self.shown += 1
+
+
+def is_animated(path):
+    return path.lower().endswith(".gif")
@@ -0,0 +1,173 @@
+import os
+import time
+import queue
+import atexit
+import logging
+import threading
+
+# Batch thresholds: whichever is reached first triggers a write
+MAX_BATCH_LINES = 256
+MAX_BATCH_DELAY = 0.5  # seconds
+MAX_QUEUED_LINES = 10000
+# How long an idle writer waits before retrying lines that failed to write
+RETRY_DELAY = 5.0  # seconds
+
+
+class AppendWriter:
+    """Background writer that group-commits appended lines
+
+    Lines are queued in memory and written by a single thread, one write
+    (and optionally one fsync) per file per batch. The queue is bounded,
+    so a producer that outruns the disk blocks instead of growing memory.
+    Lines go to the writer's own path unless append() is given another.
+    Lines that fail to write are kept, up to max_queued of them, and
+    retried with the next batch or after RETRY_DELAY. While any are
+    waiting, append() refuses new lines and flush() raises the error;
+    drain() only waits, for readers that want whatever made it to disk.
+    """
+
+    def __init__(self, path, fsync=False, max_batch=MAX_BATCH_LINES,
+                 max_delay=MAX_BATCH_DELAY, max_queued=MAX_QUEUED_LINES):
+        self.path = path
+        self.fsync = fsync
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_queued = max_queued
+        self.queue = queue.Queue(maxsize=max_queued)
+        self.thread = None
+        self.lock = threading.Lock()
+        # Held while a batch hits the file; anything that swaps the file out
+        # from under the writer (e.g. compact.compact_file) takes it too
+        self.write_lock = threading.Lock()
+        self.closed = False
+        # (path, line) pairs from a failed write, retried ahead of the next batch
+        self.unwritten = []
+        # The last write error, raised by append() and flush() while lines are still unwritten
+        self.error = None
+        self.batches = 0
+        self.lines_written = 0
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="AppendWriter", daemon=True)
+                self.thread.start()
+                atexit.register(self.close)
+
+    def append(self, line, path=None):
+        """Queue one line (without its newline) for the next batch, raising the write error while earlier lines are unwritten"""
+        if self.closed:
+            raise ValueError(f"Writer for {self.path} is closed")
+        error = self.error
+        if self.unwritten and error is not None:
+            raise error
+        if self.thread is None:
+            self.start()
+        self.queue.put((path or self.path, line))
+
+    def drain(self):
+        """Block until every line queued so far has been tried, without raising write errors"""
+        if self.thread is None or not self.thread.is_alive():
+            return
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait()
+
+    def flush(self):
+        """Block until every line queued so far is on disk, raising the write error if one is not"""
+        self.drain()
+        error = self.error
+        if error is not None:
+            if not self.unwritten:
+                # Nothing left to retry (the batch was dropped); report it once
+                self.error = None
+            raise error
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self.closed = True
+            if self.thread is not None:
+                self.queue.put(None)
+                self.thread.join()
+            if self.unwritten:
+                logging.error(f"Writer for {self.path} closed with {len(self.unwritten)} lines unwritten")
+
+    def run(self):
+        while True:
+            try:
+                # Failed lines are retried on their own once the queue goes quiet
+                item = self.queue.get(timeout=RETRY_DELAY if self.unwritten else None)
+            except queue.Empty:
+                self.commit([], [])
+                continue
+            if item is None:
+                return
+
+            batch = []
+            waiters = []
+            deadline = time.monotonic() + self.max_delay
+            while True:
+                if isinstance(item, threading.Event):
+                    # A flush cuts the batch short so the caller isn't kept waiting
+                    waiters.append(item)
+                    break
+                if item is None:
+                    self.queue.put(None)
+                    break
+                batch.append(item)
+                if len(batch) >= self.max_batch:
+                    break
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+            self.commit(batch, waiters)
+
+    def commit(self, batch, waiters):
+        try:
+            if batch or self.unwritten:
+                self.write_batch(batch)
+        except Exception as e:
+            # Never let the thread die, or every later flush() and a full queue's put() would hang
+            logging.error(f"Error writing batch of {len(batch)} lines: {e}")
+            self.error = e
+        finally:
+            for waiter in waiters:
+                waiter.set()
+
+    def write_batch(self, batch):
+        # Earlier failures go first; group by file, keeping each file's lines in the order they were queued
+        batch, self.unwritten = self.unwritten + batch, []
+        files = {}
+        for path, line in batch:
+            files.setdefault(path, []).append(line)
+
+        with self.write_lock:
+            for path, lines in files.items():
+                try:
+                    with open(path, "a", encoding="utf-8") as file:
+                        file.write("".join(f"{line}\n" for line in lines))
+                        if self.fsync:
+                            file.flush()
+                            os.fsync(file.fileno())
+                    self.lines_written += len(lines)
+                except OSError as e:
+                    logging.error(f"Error writing {len(lines)} lines to {path}, will retry: {e}")
+                    self.error = e
+                    self.unwritten.extend((path, line) for line in lines)
+        if len(self.unwritten) > self.max_queued:
+            # Held no longer than the queue would be; the oldest are kept so the files stay in order
+            logging.error(f"Dropping {len(self.unwritten) - self.max_queued} unwritten lines")
+            del self.unwritten[self.max_queued:]
+        if not self.unwritten and isinstance(self.error, OSError):
+            # The retried lines made it after all
+            self.error = None
+        self.batches += 1
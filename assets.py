@@ -0,0 +1,242 @@
+import io
+import os
+import sys
+import mmap
+import struct
+import logging
+import threading
+
+ARCHIVE_FILE = "assets.pak"
+ASSET_DIRECTORIES = ("icons", "img")
+
+# Originals larger than this are only packed as their pre-resized thumbnails
+PACK_ORIGINAL_LIMIT = 1024 * 1024
+
+MAGIC = b"TITNPAK\0"
+ARCHIVE_VERSION = 1
+# magic, version, entry count, offset of the entry table
+HEADER = struct.Struct("<8sIIQ")
+# data offset, data length, name length; the UTF-8 name follows
+ENTRY = struct.Struct("<QQH")
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".jfif", ".png", ".gif")
+
+
+def base_directory():
+    """Where the bundled assets live: PyInstaller's unpack directory, or next to this module"""
+    return getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+
+
+def asset_name(path, size=None):
+    """Archive name of an asset path, e.g. "./img/male.png" -> "img/male.png"
+
+    Absolute paths under the base directory are made relative to it; a size
+    names the pre-resized copy, as in "img/Squat.jpg@200x200".
+    """
+    if os.path.isabs(path):
+        relative = os.path.relpath(path, base_directory())
+        if not relative.startswith(os.pardir):
+            path = relative
+    name = path.replace("\\", "/")
+    while name.startswith("./"):
+        name = name[2:]
+    if size:
+        name = f"{name}@{size[0]}x{size[1]}"
+    return name
+
+
+def asset_path(path):
+    """Filesystem path of a loose asset, independent of the working directory"""
+    if os.path.isabs(path):
+        return path
+    return os.path.join(base_directory(), *asset_name(path).split("/"))
+
+
+class ArchiveSlice(io.RawIOBase):
+    """Read-only file over one entry of the mapped archive, so PIL decodes without a copy"""
+
+    def __init__(self, view):
+        super().__init__()
+        self.view = view
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        chunk = self.view[self.position:self.position + len(buffer)]
+        buffer[:len(chunk)] = chunk
+        self.position += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += len(self.view)
+        if offset < 0:
+            raise ValueError("negative seek position")
+        self.position = offset
+        return self.position
+
+    def tell(self):
+        return self.position
+
+
+class AssetArchive:
+    """Every packed icon and image in one memory-mapped file
+
+    The layout is a fixed header, the entry data, then a table of
+    (offset, length, name) entries the header points to. Opening the
+    archive reads only the table; entries are handed out as slices of the
+    mapping and paged in by the OS as they're decoded.
+    """
+
+    def __init__(self, archive_file):
+        self.archive_file = archive_file
+        with open(archive_file, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+        self.entries = {}
+        self.folded = {}
+        self.read_table()
+
+    def read_table(self):
+        magic, version, count, table_offset = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != ARCHIVE_VERSION:
+            raise ValueError(f"{self.archive_file} is not a version {ARCHIVE_VERSION} asset archive")
+        position = table_offset
+        for _ in range(count):
+            offset, length, name_length = ENTRY.unpack_from(self.map, position)
+            position += ENTRY.size
+            name = bytes(self.map[position:position + name_length]).decode("utf-8")
+            position += name_length
+            self.entries[name] = (offset, length)
+            # The lessons lists were written against Windows, where file names ignore case
+            self.folded.setdefault(name.casefold(), name)
+
+    def find(self, name):
+        if name in self.entries:
+            return name
+        return self.folded.get(name.casefold())
+
+    def __contains__(self, name):
+        return self.find(name) is not None
+
+    def get(self, name):
+        """The bytes of an entry as a memoryview, or None if it isn't packed"""
+        name = self.find(name)
+        if name is None:
+            return None
+        offset, length = self.entries[name]
+        return self.view[offset:offset + length]
+
+    def open(self, name):
+        data = self.get(name)
+        return None if data is None else ArchiveSlice(data)
+
+
+archive = None
+archive_checked = False
+archive_lock = threading.Lock()
+
+
+def get_archive():
+    """The process-wide archive, opened on first use; None when the assets aren't packed"""
+    global archive, archive_checked
+    with archive_lock:
+        if not archive_checked:
+            archive_checked = True
+            archive_file = os.environ.get("TITANS_ASSETS", os.path.join(base_directory(), ARCHIVE_FILE))
+            if os.path.exists(archive_file):
+                try:
+                    archive = AssetArchive(archive_file)
+                except (OSError, ValueError, struct.error) as e:
+                    logging.error(f"Error opening asset archive, using loose files: {e}")
+        return archive
+
+
+def packed(path, size=None):
+    """Open a packed asset (or its pre-resized copy) as a file, or None if it isn't packed"""
+    packed_archive = get_archive()
+    if packed_archive is None:
+        return None
+    return packed_archive.open(asset_name(path, size))
+
+
+def open_asset(path):
+    """Open an asset for reading, from the archive when packed or from the loose file"""
+    f = packed(path)
+    if f is None:
+        f = open(asset_path(path), "rb")
+    return f
+
+
+def asset_exists(path, size=None):
+    """Whether an asset can be loaded; with a size, a pre-resized copy in the archive counts too"""
+    packed_archive = get_archive()
+    if packed_archive is not None:
+        if asset_name(path) in packed_archive or (size and asset_name(path, size) in packed_archive):
+            return True
+    return os.path.exists(asset_path(path))
+
+
+def write_archive(archive_file, entries):
+    """Write (name, bytes) pairs as an archive, replacing archive_file atomically"""
+    tmp_file = f"{archive_file}.tmp"
+    table = []
+    with open(tmp_file, "wb") as f:
+        f.write(b"\0" * HEADER.size)
+        for name, data in entries:
+            table.append((f.tell(), len(data), name.encode("utf-8")))
+            f.write(data)
+        table_offset = f.tell()
+        for offset, length, name in table:
+            f.write(ENTRY.pack(offset, length, len(name)))
+            f.write(name)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, ARCHIVE_VERSION, len(table), table_offset))
+    os.replace(tmp_file, archive_file)
+    return len(table)
+
+
+def collect_entries(directory=None, sizes=None):
+    """Yield (name, bytes) for every asset to pack: small originals and the lessons thumbnails"""
+    from thumbnails import EXERCISE_IMAGE, LESSON_THUMBNAIL, ThumbnailCache
+
+    directory = directory or base_directory()
+    sizes = sizes or (LESSON_THUMBNAIL, EXERCISE_IMAGE)
+    cache = ThumbnailCache()
+    for asset_directory in ASSET_DIRECTORIES:
+        source_directory = os.path.join(directory, asset_directory)
+        if not os.path.isdir(source_directory):
+            continue
+        for file_name in sorted(os.listdir(source_directory)):
+            path = os.path.join(source_directory, file_name)
+            if not file_name.lower().endswith(IMAGE_EXTENSIONS) or not os.path.isfile(path):
+                continue
+            name = f"{asset_directory}/{file_name}"
+            if os.path.getsize(path) <= PACK_ORIGINAL_LIMIT:
+                with open(path, "rb") as f:
+                    yield name, f.read()
+            if asset_directory != "img":
+                continue
+            for size in sizes:
+                try:
+                    with open(cache.get_path(path, size), "rb") as f:
+                        yield asset_name(name, size), f.read()
+                except Exception as e:
+                    logging.error(f"Error building thumbnail for {name}: {e}")
+
+
+def main(argv):
+    archive_file = argv[1] if len(argv) > 1 else ARCHIVE_FILE
+    count = write_archive(archive_file, collect_entries())
+    print(f"Packed {count} assets into {archive_file} ({os.path.getsize(archive_file) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,231 @@
+import logging
+import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import customtkinter as ctk
+from PIL import Image, ImageTk
+
+# Agg has no ties to Tk, so matplotlib is imported and figures are built and
+# drawn off the UI thread. A single worker means each Figure is only ever
+# touched by one thread.
+render_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chart-render")
+
+# matplotlib's default; the size a chart assumes before it is laid out
+FIGURE_DPI = 100
+
+POLL_MS = 15
+RESIZE_DELAY_MS = 200
+
+
+class RenderCache:
+    """Rendered chart rasters keyed by (user, chart type, data version, size)
+
+    Entries are PIL images rather than PhotoImages so they stay valid
+    across Tk roots; the least recently used are dropped first.
+    """
+
+    def __init__(self, limit=16):
+        self.limit = limit
+        self.images = OrderedDict()
+
+    def get(self, key):
+        image = self.images.pop(key, None)
+        if image is not None:
+            self.images[key] = image
+        return image
+
+    def put(self, key, image):
+        self.images.pop(key, None)
+        self.images[key] = image
+        while len(self.images) > self.limit:
+            self.images.popitem(last=False)
+
+
+render_cache = RenderCache()
+
+
+class Chart:
+    """One matplotlib Figure a view keeps for its lifetime, rendered off the UI thread
+
+    plot(version, *data) hands the data to the render worker, which
+    updates the figure's artists in place and rasterises it with Agg; the
+    result is shown in a plain label once ready, so the window never
+    blocks on matplotlib, not even to import it or create the figure.
+    version identifies the data, and a (user, chart
+    type, version, size) already in render_cache is shown without
+    drawing at all. decorate(ax), if given, sets titles and labels on the
+    worker after each update.
+    """
+
+    chart_type = "chart"
+
+    def __init__(self, master, user, figsize=(8, 6), decorate=None, **frame_options):
+        self.user = user
+        self.decorate = decorate
+        self.frame = ctk.CTkFrame(master, **frame_options)
+        self.label = tk.Label(self.frame, bd=0, bg="white")
+        self.label.pack(fill="both", expand=True)
+        self.figsize = figsize
+        # Created by the first job on the render worker, so every later one finds it
+        self.figure = None
+        self.ax = None
+        render_pool.submit(self.create_figure)
+
+        self.photo = None
+        self.shown_key = None
+        self.requested_key = None
+        self.last_plot = None
+        self.resize_job = None
+        self.frame.bind("<Configure>", self.on_resize)
+
+    def create_figure(self):
+        """Runs on the render worker"""
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        self.figure = Figure(figsize=self.figsize, dpi=FIGURE_DPI)
+        FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+
+    def laid_out(self):
+        return self.frame.winfo_width() > 1 and self.frame.winfo_height() > 1
+
+    def size(self):
+        width, height = self.frame.winfo_width(), self.frame.winfo_height()
+        if width <= 1 or height <= 1:
+            # Not laid out yet; use the figure's own size
+            return int(self.figsize[0] * FIGURE_DPI), int(self.figsize[1] * FIGURE_DPI)
+        return width, height
+
+    @property
+    def pixel_width(self):
+        return self.size()[0]
+
+    def show(self, **pack_options):
+        self.frame.pack(**pack_options)
+
+    def hide(self):
+        self.frame.pack_forget()
+
+    def plot(self, version, *data):
+        self.last_plot = (version, data)
+        if not self.laid_out():
+            # Rendered from on_resize once the frame has its real size
+            return
+        key = (self.user, self.chart_type, version, self.size())
+        if key == self.shown_key:
+            return
+        self.requested_key = key
+        image = render_cache.get(key)
+        if image is not None:
+            self.display(key, image)
+            return
+        future = render_pool.submit(self.render, key[3], data)
+        self.frame.after(POLL_MS, self.poll, future, key)
+
+    def render(self, size, data):
+        """Runs on the render worker"""
+        width, height = size
+        self.figure.set_size_inches(width / self.figure.dpi, height / self.figure.dpi)
+        self.draw(*data)
+        if self.decorate is not None:
+            self.decorate(self.ax)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        canvas = self.figure.canvas
+        canvas.draw()
+        return Image.frombuffer("RGBA", canvas.get_width_height(), bytes(canvas.buffer_rgba()), "raw", "RGBA", 0, 1)
+
+    def poll(self, future, key):
+        try:
+            if not future.done():
+                self.frame.after(POLL_MS, self.poll, future, key)
+                return
+            image = future.result()
+        except tk.TclError:
+            # The view was destroyed while rendering
+            return
+        except Exception as e:
+            logging.error(f"Error rendering {self.chart_type} chart: {e}")
+            return
+        render_cache.put(key, image)
+        # A newer plot() was requested meanwhile; its own poll will display it
+        if key == self.requested_key:
+            self.display(key, image)
+
+    def display(self, key, image):
+        try:
+            self.photo = ImageTk.PhotoImage(image)
+            self.label.configure(image=self.photo)
+            self.shown_key = key
+        except tk.TclError:
+            pass
+
+    def on_resize(self, event):
+        if self.last_plot is None:
+            return
+        if self.shown_key is None:
+            self.replot()
+            return
+        if self.resize_job is not None:
+            self.frame.after_cancel(self.resize_job)
+        self.resize_job = self.frame.after(RESIZE_DELAY_MS, self.replot)
+
+    def replot(self):
+        self.resize_job = None
+        version, data = self.last_plot
+        self.plot(version, *data)
+
+    def draw(self, *data):
+        raise NotImplementedError
+
+    def destroy(self):
+        self.frame.destroy()
+        render_pool.submit(self.clear_figure)
+
+    def clear_figure(self):
+        """Runs on the render worker"""
+        if self.figure is not None:
+            self.figure.clear()
+
+
+class LineChart(Chart):
+    chart_type = "line"
+
+    def __init__(self, master, user, figsize=(8, 6), decorate=None, **frame_options):
+        super().__init__(master, user, figsize, decorate, **frame_options)
+        self.line = None
+        self.dated = None
+
+    def draw(self, xs, ys, dated=False):
+        if self.line is None or dated != self.dated:
+            # Date and number axes use different unit converters, so switching needs fresh axes
+            self.ax.clear()
+            self.line, = self.ax.plot(xs, ys)
+            self.dated = dated
+        else:
+            self.line.set_data(xs, ys)
+        self.line.set_marker('o' if len(xs) <= 60 else None)
+
+
+class BarChart(Chart):
+    chart_type = "bar"
+
+    def __init__(self, master, user, figsize=(6, 4), colors=None, decorate=None, **frame_options):
+        super().__init__(master, user, figsize, decorate, **frame_options)
+        self.colors = colors
+        self.bars = None
+        self.labels = None
+
+    def draw(self, labels, values):
+        labels = list(labels)
+        if self.bars is not None and labels == self.labels:
+            for bar, value in zip(self.bars, values):
+                bar.set_height(value)
+        else:
+            # Category axes remember every label they have seen, so start from clean axes
+            self.ax.clear()
+            self.bars = self.ax.bar(labels, values, color=self.colors, edgecolor='black', linewidth=1.5)
+            for bar in self.bars:
+                bar.set_linewidth(0)
+                bar.set_capstyle('round')
+            self.labels = labels
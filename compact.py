@@ -0,0 +1,113 @@
+import os
+import sys
+import hashlib
+import logging
+import threading
+from records import DATA_FILE, parse_line
+from user_directory import UserDirectory
+
+
+class CompactionStats:
+    def __init__(self):
+        self.lines_in = 0
+        self.lines_out = 0
+        self.duplicates = 0
+        self.normalised = 0
+        self.tail_bytes = 0
+        self.bytes_before = 0
+        self.bytes_after = 0
+
+    def summary(self):
+        return (
+            f"{self.lines_in} lines -> {self.lines_out} "
+            f"({self.duplicates} duplicates dropped, {self.normalised} rows normalised, "
+            f"{self.tail_bytes} bytes appended during compaction carried over); "
+            f"{self.bytes_before} -> {self.bytes_after} bytes"
+        )
+
+
+def compact_lines(lines, stats):
+    """Yield each distinct record once, rewritten in the current line format"""
+    seen = set()
+    for line in lines:
+        stats.lines_in += 1
+        text = line.rstrip("\r\n")
+        if not text.strip():
+            continue
+
+        record = parse_line(text)
+        if record is not None:
+            # Legacy rows (e.g. 7-column workouts) come back out in the current layout
+            normalised = record.to_line()
+            if normalised != text:
+                stats.normalised += 1
+            text = normalised
+
+        digest = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        if digest in seen:
+            stats.duplicates += 1
+            continue
+        seen.add(digest)
+        stats.lines_out += 1
+        yield text
+
+
+def compact_file(path=DATA_FILE, write_lock=None):
+    """Rewrite a data file without duplicate rows and swap it in atomically
+
+    Safe to run while the app is appending: bytes written after the
+    compaction snapshot are carried over verbatim, and write_lock (an
+    AppendWriter's) is held for the final catch-up and rename.
+    """
+    stats = CompactionStats()
+    tmp_path = f"{path}.compact"
+    write_lock = write_lock or threading.Lock()
+    consumed = 0
+
+    with open(path, "rb") as source:
+        snapshot = os.fstat(source.fileno()).st_size
+        stats.bytes_before = snapshot
+
+        def complete_lines():
+            # Stop at the snapshot and at a half-written line; both go to the tail copy
+            nonlocal consumed
+            for line in source:
+                if consumed + len(line) > snapshot or not line.endswith(b"\n"):
+                    return
+                consumed += len(line)
+                yield line.decode("utf-8", errors="replace")
+
+        with open(tmp_path, "w", encoding="utf-8", newline="\n") as target:
+            for text in compact_lines(complete_lines(), stats):
+                target.write(f"{text}\n")
+
+    with write_lock:
+        # Anything appended since the snapshot is live data: keep it as is
+        with open(path, "rb") as source, open(tmp_path, "ab") as target:
+            source.seek(consumed)
+            tail = source.read()
+            stats.tail_bytes = len(tail)
+            target.write(tail)
+            target.flush()
+            os.fsync(target.fileno())
+        os.replace(tmp_path, path)
+
+    stats.bytes_after = os.path.getsize(path)
+    logging.info(f"Compacted {path}: {stats.summary()}")
+    return stats
+
+
+def main(argv):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    path = argv[1] if len(argv) > 1 else DATA_FILE
+
+    stats = compact_file(path)
+    # The rename gave the file a new inode, so this rebuilds the saved index
+    users = UserDirectory(path)
+    users.refresh()
+    users.close()
+    print(stats.summary())
+
+
+if __name__ == "__main__":
+    main(sys.argv)
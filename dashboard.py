@@ -1,31 +1,40 @@
 import customtkinter as ctk
-from PIL import Image, ImageTk  # Ensure ImageTk is imported
-import os
+from PIL import ImageTk  # Ensure ImageTk is imported
 import datetime
 import tkinter.messagebox as messagebox
 from tkcalendar import Calendar
 import tkinter as tk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import sys
 import random
-import json
+from charts import BarChart
+from dates import format_date
+from records import Workout, workout_metrics
+from storage import get_repository
+from animation import AnimationPlayer, is_animated
+from assets import asset_exists
+from image_cache import get_image
+from lazy_images import LazyThumbnails
+from navigator import start
+from thumbnails import EXERCISE_IMAGE, LESSON_THUMBNAIL, get_thumbnail
+from virtual_list import VirtualList
 
 # Import the exercises data
 # from exercises import exercises
 
-# Initialize customtkinter
-ctk.set_appearance_mode("light")
-ctk.set_default_color_theme("blue")
-
 # Global variables
 root = None
+navigator = None
 main_content_frame = None
 recent_workouts_textbox = None
 progress_label = None
 profile_label = None
 nav_buttons = []
+theme_var = None
+font_size_var = None
 notification_var = None
+reminder_var = None
+current_email = None
+calories_chart = None
 
 # Function to read user data from the text file
 def load_user_data(email):
@@ -33,19 +42,23 @@ def load_user_data(email):
         "workouts": [],
         "measurements": {}
     }
-    
-    # Load workout data
-    try:
-        with open("FitnessTrackerData.txt", "r") as file:
-            lines = file.readlines()
-            for line in lines:
-                data = line.strip().split(',')
-                if data[0] == email:
-                    user_data["workouts"].append(','.join(data[1:]))
-    except FileNotFoundError:
-        print("No workout data found")
 
-    # Load measurements data
+    repository = get_repository()
+    user_data["workouts"] = repository.get_workouts(email)
+
+    measurement = repository.latest_measurement(email)
+    if measurement:
+        goal = repository.latest_goal(email)
+        user_data["measurements"] = {
+            "height": measurement.height,
+            "weight": measurement.weight,
+            "age": measurement.age,
+            "gender": measurement.gender,
+            "goal": goal.goal if goal else "Not specified"
+        }
+        return user_data
+
+    # Fall back to the legacy measurements file
     try:
         with open("measurements.txt", "r") as file:
             lines = file.readlines()
@@ -67,37 +80,51 @@ def load_user_data(email):
 
 # Function to load and display recent workouts
 def load_recent_workouts(email):
-    user_data = load_user_data(email)
-    workouts = user_data.get("workouts", [])
+    workouts, _ = get_repository().get_workout_page(email)
     recent_workouts_textbox.delete("1.0", ctk.END)  # Clear textbox before loading new data
     if workouts:
         for workout in workouts:
-            recent_workouts_textbox.insert(ctk.END, f"{workout}\n")
+            recent_workouts_textbox.insert(
+                ctk.END,
+                f"{workout.exercise}, {format_date(workout.date)}, {workout.duration} mins, {workout.calories} kcal\n"
+            )
     else:
         recent_workouts_textbox.insert(ctk.END, "No recent workouts recorded.")
 
-# Function to create the dashboard
-def create_dashboard(email, user_name):
-    global root, main_content_frame, recent_workouts_textbox, progress_label, profile_label
-    root = ctk.CTk()
-    root.title("Titan Fitness Tracker/Dashboard")
+def clear_main_content():
+    """Destroy the current view's widgets; the calories chart is only hidden, for reuse"""
+    for widget in main_content_frame.winfo_children():
+        if calories_chart is not None and widget is calories_chart.frame:
+            calories_chart.hide()
+        else:
+            widget.destroy()
 
-    # Set the window to open in full screen immediately
-    # root.attributes('-fullscreen', True)
-    root.geometry(f"{root.winfo_screenwidth()}x{root.winfo_screenheight()}+0+0")
+# Function to create the dashboard in its own window
+def create_dashboard(email, user_name):
+    # Initialize customtkinter
+    ctk.set_appearance_mode("light")
+    ctk.set_default_color_theme("blue")
+    start(show_dashboard, email, user_name, title="Titan Fitness Tracker/Dashboard")
+
+# Build the dashboard into the navigator's window
+def show_dashboard(screen_navigator, email, user_name):
+    global root, navigator, main_content_frame, recent_workouts_textbox, progress_label, profile_label, current_email, calories_chart
+    current_email = email
+    calories_chart = None
+    navigator = screen_navigator
+    root = navigator.root
+    navigator.set_title("Titan Fitness Tracker/Dashboard")
 
     # Set custom logo in the title bar
     try:
-        new_logo_image = Image.open("icons/new_logo.png")
-        new_logo_image = new_logo_image.resize((32, 32), Image.ANTIALIAS)
-        new_logo_photo = ImageTk.PhotoImage(new_logo_image)
+        new_logo_photo = get_image("icons/new_logo.png", (32, 32), "photo")
         root.iconphoto(False, new_logo_photo)
     except Exception as e:
         print(f"Error loading logo: {e}")
 
     # Load the icon for the welcome label
     try:
-        welcome_icon = ctk.CTkImage(light_image=Image.open("icons/welcome_icon.png"), size=(20, 20))
+        welcome_icon = get_image("icons/welcome_icon.png", (20, 20))
     except Exception:
         welcome_icon = None
 
@@ -119,7 +146,7 @@ def create_dashboard(email, user_name):
     profile_frame.pack(fill="x")
 
     try:
-        profile_picture_icon = ctk.CTkImage(light_image=Image.open("icons/logo2.png"), size=(80, 80))
+        profile_picture_icon = get_image("icons/logo2.png", (80, 80))
     except Exception:
         profile_picture_icon = None
 
@@ -146,12 +173,12 @@ def create_dashboard(email, user_name):
 
     # Load icons
     try:
-        logout_icon = ctk.CTkImage(light_image=Image.open("icons/logout.png"), size=(20, 20))
-        workout_icon = ctk.CTkImage(light_image=Image.open("icons/workout.png"), size=(20, 20))
-        progress_icon = ctk.CTkImage(light_image=Image.open("icons/progress.png"), size=(20, 20))
-        history_icon = ctk.CTkImage(light_image=Image.open("icons/history.png"), size=(20, 20))
-        lessons_icon = ctk.CTkImage(light_image=Image.open("icons/workout.png"), size=(20, 20))
-        settings_icon = ctk.CTkImage(light_image=Image.open("icons/settings.png"), size=(20, 20))
+        logout_icon = get_image("icons/logout.png", (20, 20))
+        workout_icon = get_image("icons/workout.png", (20, 20))
+        progress_icon = get_image("icons/progress.png", (20, 20))
+        history_icon = get_image("icons/history.png", (20, 20))
+        lessons_icon = get_image("icons/workout.png", (20, 20))
+        settings_icon = get_image("icons/settings.png", (20, 20))
     except Exception:
         logout_icon = workout_icon = progress_icon = history_icon = lessons_icon = settings_icon = None
 
@@ -185,65 +212,42 @@ def create_dashboard(email, user_name):
     load_recent_workouts(email)
     show_progress_line_graph(email)
 
-    root.mainloop()
-
 def show_recent_workouts(email):
     # Clear the current content
-    for widget in main_content_frame.winfo_children():
-        widget.destroy()
+    clear_main_content()
 
     recent_workouts_frame = ctk.CTkFrame(main_content_frame, fg_color="white", corner_radius=10)
     recent_workouts_frame.pack(pady=20, padx=20, fill="both", expand=True)
 
     ctk.CTkLabel(recent_workouts_frame, text="All Workouts", font=ctk.CTkFont(size=20, weight="bold")).pack(pady=10)
 
-    # Create a frame to display all workouts in a visually appealing format
-    workouts_display_frame = ctk.CTkFrame(recent_workouts_frame, fg_color="lightgrey", corner_radius=5)
-    workouts_display_frame.pack(pady=10, padx=10, fill="both", expand=True)
-
-    # Load user data
-    user_data = load_user_data(email)
-    workouts = user_data.get("workouts", [])
-
-    # Debugging output
-    print(f"Loaded workouts for {email}: {workouts}")
-
     # Function to generate a color for each unique date
     def get_color_for_date(date):
-        # Simple hash function to generate a color from a date string
+        # Simple hash function to generate a color from a day number
         return f"#{hash(date) & 0xFFFFFF:06x}"
 
-    if workouts:
-        for workout in workouts:
-            workout_details = workout.split(',')
-            if len(workout_details) < 3:
-                continue  # Skip malformed entries
-
-            exercise, date, duration = workout_details[:3]
-            workout_text = f"Exercise: {exercise}, Date: {date}, Duration: {duration} mins"
-            color = get_color_for_date(date)  # Get a color for the date
-
-            workout_label = ctk.CTkLabel(
-                workouts_display_frame, 
-                text=workout_text, 
-                font=ctk.CTkFont(size=14),
-                text_color=color  # Set the text color
-            )
-            workout_label.pack(pady=5, padx=5, anchor='w')
-    else:
-        ctk.CTkLabel(workouts_display_frame, text="No workouts recorded.", font=ctk.CTkFont(size=14)).pack(pady=10)
+    # A fixed pool of labels is recycled on scroll, with workouts fetched a page at a time
+    repo = get_repository()
+    workouts_display_frame = VirtualList(
+        recent_workouts_frame,
+        lambda offset, limit: repo.get_workouts_at(email, offset, limit),
+        repo.count_workouts(email),
+        lambda workout: f"Exercise: {workout.exercise}, Date: {format_date(workout.date)}, Duration: {workout.duration} mins",
+        row_color=lambda workout: get_color_for_date(workout.date),
+        fg_color="lightgrey",
+        corner_radius=5
+    )
+    workouts_display_frame.pack(pady=10, padx=10, fill="both", expand=True)
 
 def logout():
     # Ask for confirmation before logging out
     if messagebox.askyesno("Confirm Logout", "Are you sure you want to log out?"):
-        root.destroy()  # Close the current dashboard window
-        import Login  # Import and run the Login module directly
-        Login.main()  # Assuming Login.py has a main() function
+        import Login  # Back to the login screen in the same window
+        navigator.show(Login.show_login)
 
 def log_workout(email):
     # Clear the current content
-    for widget in main_content_frame.winfo_children():
-        widget.destroy()
+    clear_main_content()
 
     # Create a frame for logging workouts
     log_workout_frame = ctk.CTkFrame(main_content_frame, fg_color="white", corner_radius=10)
@@ -278,18 +282,26 @@ def log_workout(email):
 
     def calculate_and_save():
         exercise_type = exercise_var.get()
-        workout_date = calendar.get_date()
-        duration = int(duration_entry.get())
+        # selection_get() is a datetime.date, unlike get_date()'s locale-formatted string
+        workout_date = calendar.selection_get()
+        if workout_date is None:
+            messagebox.showerror("Error", "Please select a date")
+            return
+        try:
+            duration = int(duration_entry.get())
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a valid duration")
+            return
 
         # Placeholder calculations
-        calories_burnt = duration * 5  # Example: 5 calories per minute
-        weight_loss = duration * 0.01  # Example: 0.01 kg per minute
-        strength = duration * 0.1  # Example: strength increases by 0.1 units per minute
-        stamina = duration / 10  # Example: stamina increases with duration
+        calories_burnt, weight_loss, strength, stamina = workout_metrics(duration)
+        workout = Workout(email, exercise_type, workout_date, duration, calories_burnt, weight_loss, strength, stamina)
 
-        # Save to file
-        with open("FitnessTrackerData.txt", "a") as file:
-            file.write(f"{email},{exercise_type},{workout_date},{duration},{calories_burnt},{weight_loss},{strength},{stamina}\n")
+        try:
+            get_repository().add_workout(workout)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not log workout: {e}")
+            return
 
         messagebox.showinfo("Workout Logged", "Your workout has been logged successfully!")
 
@@ -298,45 +310,28 @@ def log_workout(email):
     log_button.pack(pady=20)
 
 def show_progress_line_graph(email):
+    global calories_chart
     # Clear the current content
-    for widget in main_content_frame.winfo_children():
-        widget.destroy()
-
-    progress_frame = ctk.CTkFrame(main_content_frame, fg_color="white", corner_radius=10)
-    progress_frame.pack(pady=20, padx=20, fill="both", expand=True)
-
-    # Load user data
-    user_data = load_user_data(email)
-    workouts = user_data.get("workouts", [])
-
-    # Prepare data for plotting
-    exercise_types = []
-    calories = []
-
-    for workout in workouts:
-        workout_details = workout.split(',')
-        
-        # Skip malformed entries
-        if len(workout_details) < 5:  # We need at least 5 elements to get calories
-            continue
-
-        exercise_type = workout_details[0]
-        try:
-            calories_burnt = float(workout_details[4])  # Calories is the fifth item
-        except (ValueError, IndexError):
-            continue
-
-        if exercise_type in exercise_types:
-            index = exercise_types.index(exercise_type)
-            calories[index] += calories_burnt
-        else:
-            exercise_types.append(exercise_type)
-            calories.append(calories_burnt)
+    clear_main_content()
+
+    # Per-exercise totals are kept up to date by the storage layer as workouts are logged
+    totals = get_repository().get_totals(email, "exercise")
+    exercise_types = list(totals)
+    calories = [float(total["calories"]) for total in totals.values()]
+
+    # The chart is built on the first visit and its bars updated in place afterwards
+    if calories_chart is None:
+        calories_chart = BarChart(
+            main_content_frame, email, colors=['#4CAF50', '#2196F3', '#FFC107'],
+            decorate=decorate_calories_chart, fg_color="white", corner_radius=10
+        )
+    calories_chart.show(pady=20, padx=20, fill="both", expand=True)
 
-    # Create a bar graph
-    fig, ax = plt.subplots(figsize=(6, 4))
-    bars = ax.bar(exercise_types, calories, color=['#4CAF50', '#2196F3', '#FFC107'], edgecolor='black', linewidth=1.5)
+    # Drawn on the render worker; unchanged totals are shown from the render cache
+    version = hash((tuple(exercise_types), tuple(calories)))
+    calories_chart.plot(version, exercise_types, calories)
 
+def decorate_calories_chart(ax):
     # Customize the graph
     ax.set_title("Calories Burned by Exercise Type", fontsize=16, fontweight='bold')
     ax.set_xlabel("Exercise Type", fontsize=12)
@@ -344,22 +339,11 @@ def show_progress_line_graph(email):
     ax.set_facecolor('#f0f0f0')
     ax.grid(False)
 
-    # Set rounded edges for bars
-    for bar in bars:
-        bar.set_linewidth(0)
-        bar.set_capstyle('round')
-
-    # Embed the graph
-    canvas = FigureCanvasTkAgg(fig, master=progress_frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack(pady=10, fill='both', expand=True)
-
 def show_lessons():
     print("Starting show_lessons function")  # Debug print 1
     
     # Clear the current content in the main content frame
-    for widget in main_content_frame.winfo_children():
-        widget.destroy()
+    clear_main_content()
     print("Cleared main content frame")  # Debug print 2
 
     # Set a background color
@@ -445,17 +429,22 @@ def show_lessons():
             widget.destroy()
 
         try:
-            image_path = os.path.join(image_directory, image_file)
-            if not os.path.exists(image_path):
+            image_path = f"{image_directory}/{image_file}"
+            if not asset_exists(image_path, EXERCISE_IMAGE):
                 print(f"Exercise image not found: {image_path}")
                 return
             
-            img = Image.open(image_path)
-            img = img.resize((400, 300), Image.LANCZOS)
-            img = ImageTk.PhotoImage(img)
-
-            image_label = ctk.CTkLabel(content_frame, image=img, text="")
-            image_label.image = img
+            if is_animated(image_path):
+                # Frames stream in from a background decoder; the player stops when the label goes
+                image_label = ctk.CTkLabel(content_frame, text="")
+                image_label.player = AnimationPlayer(image_label, image_path, EXERCISE_IMAGE).start()
+            else:
+                # Served from the thumbnail cache instead of decoding the full-size original
+                img = get_thumbnail(image_path, EXERCISE_IMAGE)
+                img = ImageTk.PhotoImage(img)
+
+                image_label = ctk.CTkLabel(content_frame, image=img, text="")
+                image_label.image = img
             image_label.grid(row=1, column=0, padx=20, pady=20, sticky="nsew")
 
             instructions_label = ctk.CTkLabel(content_frame, 
@@ -468,10 +457,8 @@ def show_lessons():
             print(f"Error loading image {image_file}: {e}")
 
     # Load exercises
-    current_directory = os.path.dirname(os.path.abspath(__file__))
-    image_directory = os.path.join(current_directory, "img")
-    print(f"Image directory path: {image_directory}")  # Debug print 4
-    print(f"Directory exists: {os.path.exists(image_directory)}")  # Debug print 5
+    # Resolved against the app rather than the working directory (see assets)
+    image_directory = "img"
 
     exercises = [
         ("Barbell Bench Press", "barbell bench press.jpg", 
@@ -525,25 +512,22 @@ def show_lessons():
          "3. Press the weights back up until your arms are straight."),
     ]
 
+    # Rows appear with text right away; thumbnails are decoded in the background, visible rows first
+    thumbnails = LazyThumbnails(scroll_canvas, scrollable_frame)
+    scrollbar.configure(command=thumbnails.yview)
+
     for index, (exercise, image_file, instructions) in enumerate(exercises):
         try:
-            image_path = os.path.join(image_directory, image_file)
-            print(f"Trying to load image: {image_path}")  # Debug print 6
-            print(f"Image file exists: {os.path.exists(image_path)}")  # Debug print 7
+            image_path = f"{image_directory}/{image_file}"
 
-            if not os.path.exists(image_path):
+            if not asset_exists(image_path, LESSON_THUMBNAIL):
                 print(f"Exercise image not found: {image_path}")
                 continue
 
-            img = Image.open(image_path)
-            print(f"Successfully opened image for {exercise}")  # Debug print 8
-            img = img.resize((200, 200), Image.LANCZOS)
-            img = ImageTk.PhotoImage(img)
-
-            label = ctk.CTkLabel(scrollable_frame, image=img, text=exercise, 
+            label = ctk.CTkLabel(scrollable_frame, text=exercise, 
                                compound="left", padx=10, pady=5)
-            label.image = img  # Keep a reference!
             label.grid(row=index + 1, column=0, padx=10, pady=5, sticky="w")
+            thumbnails.request(label, image_path, LESSON_THUMBNAIL)
             print(f"Created label for {exercise}")  # Debug print 9
 
             label.bind("<Button-1>", 
@@ -553,13 +537,17 @@ def show_lessons():
         except Exception as e:
             print(f"Error loading image {image_file}: {str(e)}")  # More detailed error message
 
+    thumbnails.start()
+
     # Start updating quotes
     update_quote()
 
 def show_settings():
+    global theme_var, font_size_var, notification_var, reminder_var
+    settings = get_repository().get_settings(current_email) or {}
+
     # Clear the current content
-    for widget in main_content_frame.winfo_children():
-        widget.destroy()
+    clear_main_content()
 
     # Create a frame for settings
     settings_frame = ctk.CTkFrame(main_content_frame, fg_color="white", corner_radius=10)
@@ -573,7 +561,7 @@ def show_settings():
     theme_frame.pack(pady=10, padx=20, fill="x")
 
     ctk.CTkLabel(theme_frame, text="App Theme:", font=ctk.CTkFont(size=16)).pack(side="left", padx=(0, 10))
-    theme_var = ctk.StringVar(value=ctk.get_appearance_mode())
+    theme_var = ctk.StringVar(value=settings.get("theme", ctk.get_appearance_mode()).capitalize())
     theme_dropdown = ctk.CTkOptionMenu(theme_frame, values=["Light", "Dark", "System"], 
                                        variable=theme_var, command=change_theme)
     theme_dropdown.pack(side="left")
@@ -590,7 +578,7 @@ def show_settings():
     font_frame.pack(pady=10, padx=20, fill="x")
 
     ctk.CTkLabel(font_frame, text="Font Size:", font=ctk.CTkFont(size=16)).pack(side="left", padx=(0, 10))
-    font_size_var = ctk.StringVar(value="Medium")
+    font_size_var = ctk.StringVar(value=settings.get("font_size", "Medium"))
     font_size_dropdown = ctk.CTkOptionMenu(font_frame, values=["Small", "Medium", "Large"], 
                                            variable=font_size_var, command=change_font_size)
     font_size_dropdown.pack(side="left")
@@ -600,7 +588,7 @@ def show_settings():
     notification_frame.pack(pady=10, padx=20, fill="x")
 
     ctk.CTkLabel(notification_frame, text="Notifications:", font=ctk.CTkFont(size=16)).pack(side="left", padx=(0, 10))
-    notification_var = ctk.BooleanVar(value=True)
+    notification_var = ctk.BooleanVar(value=settings.get("notifications", True))
     notification_switch = ctk.CTkSwitch(notification_frame, text="Enable", variable=notification_var, 
                                         command=toggle_notifications)
     notification_switch.pack(side="left")
@@ -610,7 +598,7 @@ def show_settings():
     reminder_frame.pack(pady=10, padx=20, fill="x")
 
     ctk.CTkLabel(reminder_frame, text="Workout Reminders:", font=ctk.CTkFont(size=16)).pack(side="left", padx=(0, 10))
-    reminder_var = ctk.BooleanVar(value=False)
+    reminder_var = ctk.BooleanVar(value=settings.get("reminders", False))
     reminder_switch = ctk.CTkSwitch(reminder_frame, text="Enable", variable=reminder_var, 
                                     command=toggle_reminders)
     reminder_switch.pack(side="left")
@@ -650,8 +638,8 @@ def save_settings():
     }
     
     try:
-        with open("user_settings.json", "w") as f:
-            json.dump(settings, f)
+        # Only this member's keys are merged and rewritten
+        get_repository().update_settings(current_email, settings)
         messagebox.showinfo("Settings Saved", "Your settings have been saved successfully!")
     except Exception as e:
         messagebox.showerror("Error", f"Failed to save settings: {e}")
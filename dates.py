@@ -0,0 +1,56 @@
+import datetime
+from bisect import bisect_left, bisect_right
+
+# Formats tkcalendar's get_date() has produced in stored rows, most likely first.
+# Month-first wins for ambiguous dates because the kiosks ran the en_US default.
+LEGACY_FORMATS = ("%m/%d/%y", "%m/%d/%Y", "%d/%m/%y", "%d/%m/%Y", "%Y-%m-%d", "%d.%m.%y", "%d.%m.%Y")
+
+
+def to_ordinal(value):
+    """Canonical day number (datetime.date.toordinal) of a date, datetime, ordinal or legacy string"""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, datetime.datetime):
+        return value.date().toordinal()
+    if isinstance(value, datetime.date):
+        return value.toordinal()
+
+    text = value.strip()
+    if text.isdigit():
+        return int(text)
+    for date_format in LEGACY_FORMATS:
+        try:
+            return datetime.datetime.strptime(text, date_format).toordinal()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognised date: {value!r}")
+
+
+def from_ordinal(ordinal):
+    return datetime.date.fromordinal(ordinal)
+
+
+def format_date(ordinal):
+    """Unambiguous display form of a stored day number"""
+    return from_ordinal(ordinal).strftime("%d %b %Y")
+
+
+class DateIndex:
+    """Items kept sorted by day number, for range queries by binary search"""
+
+    def __init__(self):
+        self.keys = []
+        self.items = []
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, ordinal, item):
+        # Most workouts are logged for today, so this is usually an append
+        index = bisect_right(self.keys, ordinal)
+        self.keys.insert(index, ordinal)
+        self.items.insert(index, item)
+
+    def between(self, start, end):
+        """Items dated from start to end inclusive"""
+        return self.items[bisect_left(self.keys, start):bisect_right(self.keys, end)]
@@ -0,0 +1,47 @@
+def lttb(xs, ys, threshold):
+    """Largest-Triangle-Three-Buckets: keep threshold points that preserve the series' shape
+
+    xs must be increasing. The first and last points are always kept, and
+    each bucket in between contributes the point forming the largest
+    triangle with the previous pick and the next bucket's average, so
+    peaks and dips survive where plain striding would skip them.
+    """
+    count = len(xs)
+    if threshold >= count or threshold < 3:
+        return list(xs), list(ys)
+
+    out_x = [xs[0]]
+    out_y = [ys[0]]
+    bucket_size = (count - 2) / (threshold - 2)
+    previous = 0
+
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+
+        # Average of the next bucket (the last point for the final bucket)
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, count)
+        if next_start >= next_end:
+            next_start, next_end = count - 1, count
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        prev_x = xs[previous]
+        prev_y = ys[previous]
+        best = start
+        best_area = -1.0
+        for i in range(start, end):
+            area = abs((prev_x - avg_x) * (ys[i] - prev_y) - (prev_x - xs[i]) * (avg_y - prev_y))
+            if area > best_area:
+                best_area = area
+                best = i
+
+        out_x.append(xs[best])
+        out_y.append(ys[best])
+        previous = best
+
+    out_x.append(xs[-1])
+    out_y.append(ys[-1])
+    return out_x, out_y
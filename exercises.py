@@ -1,7 +1,10 @@
 import customtkinter as ctk
-from PIL import Image, ImageTk
-import os
+from PIL import ImageTk
 import random
+from animation import AnimationPlayer, is_animated
+from assets import asset_exists
+from lazy_images import LazyThumbnails
+from thumbnails import EXERCISE_IMAGE, LESSON_THUMBNAIL, get_thumbnail
 
 def create_workout_app():
     # Initialize the application
@@ -53,8 +56,8 @@ def create_workout_app():
     exercise_list_label = ctk.CTkLabel(scrollable_frame, text="Exercises", font=ctk.CTkFont(size=22, weight="bold"), text_color="black")
     exercise_list_label.grid(row=0, column=0, padx=10, pady=10, sticky="w")
 
-    # Image directory
-    image_directory = r"F:\Recent Fitness App\New fitness App"
+    # Image directory, resolved against the app rather than the working directory (see assets)
+    image_directory = "img"
 
     # List of exercises
     exercises = [
@@ -143,7 +146,7 @@ def create_workout_app():
          "2. Keep your back straight and shoulders relaxed against the wall.\n"
          "3. Hold the position for as long as possible, engaging your core and keeping your knees behind your toes."),
        
-        ("Mountain Climbers", "Mountain Climber.jpg", 
+        ("Mountain Climbers", "Mountain climber.gif", 
          "1. Start in a high plank position with your hands directly under your shoulders.\n"
          "2. Engage your core and quickly drive one knee toward your chest.\n"
          "3. Alternate legs rapidly, as if you're running in place, while keeping your hips level."),
@@ -197,26 +200,30 @@ def create_workout_app():
             widget.destroy()
 
         try:
-            image_path = os.path.join(image_directory, image_file)
-            if not os.path.exists(image_path):
+            image_path = f"{image_directory}/{image_file}"
+            if not asset_exists(image_path, EXERCISE_IMAGE):
                 print(f"Exercise image not found: {image_path}")
                 return
             
-            img = Image.open(image_path)
-            img = img.resize((400, 300), Image.LANCZOS)
-            img = ImageTk.PhotoImage(img)
+            if is_animated(image_path):
+                # Frames stream in from a background decoder; the player stops when the label goes
+                image_label = ctk.CTkLabel(main_content_frame, text="")
+                image_label.player = AnimationPlayer(image_label, image_path, EXERCISE_IMAGE).start()
+            else:
+                # Served from the thumbnail cache instead of decoding the full-size original
+                img = get_thumbnail(image_path, EXERCISE_IMAGE)
+                img = ImageTk.PhotoImage(img)
 
-            image_label = ctk.CTkLabel(main_content_frame, image=img, text="")
-            image_label.image = img
+                image_label = ctk.CTkLabel(main_content_frame, image=img, text="")
+                image_label.image = img
             image_label.grid(row=1, column=0, padx=20, pady=20, sticky="nsew")
 
             instructions_label = ctk.CTkLabel(main_content_frame, text=f"{exercise_name}\n\n{instructions}", font=ctk.CTkFont(size=18), justify="left")
             instructions_label.grid(row=2, column=0, padx=20, pady=20, sticky="nsew")
 
             # Back icon path and button
-            back_icon_path = os.path.join(image_directory, "back-icon.png")  # Change to your icon filename
-            back_icon = Image.open(back_icon_path)
-            back_icon = back_icon.resize((30, 30), Image.LANCZOS)
+            back_icon_path = f"{image_directory}/back-icon.png"  # Change to your icon filename
+            back_icon = get_thumbnail(back_icon_path, (30, 30))
             back_icon = ImageTk.PhotoImage(back_icon)
 
             back_button = ctk.CTkButton(main_content_frame, image=back_icon, text=" Back", command=load_exercises)
@@ -242,26 +249,31 @@ def create_workout_app():
 
         update_quote()  # Start updating quotes
 
+        # Rows appear with text right away; thumbnails are decoded in the background, visible rows first
+        for widget in scrollable_frame.winfo_children():
+            if widget is not exercise_list_label:
+                widget.destroy()
+        thumbnails = LazyThumbnails(scroll_canvas, scrollable_frame)
+        scrollbar.configure(command=thumbnails.yview)
+
         for index, (exercise, image_file, instructions) in enumerate(exercises):
             try:
-                image_path = os.path.join(image_directory, image_file)
-                if not os.path.exists(image_path):
+                image_path = f"{image_directory}/{image_file}"
+                if not asset_exists(image_path, LESSON_THUMBNAIL):
                     print(f"Exercise image not found: {image_path}")
                     continue
 
-                img = Image.open(image_path)
-                img = img.resize((200, 200), Image.LANCZOS)
-                img = ImageTk.PhotoImage(img)
-
-                label = ctk.CTkLabel(scrollable_frame, image=img, text=exercise, compound="left", padx=10, pady=5)
-                label.image = img
+                label = ctk.CTkLabel(scrollable_frame, text=exercise, compound="left", padx=10, pady=5)
                 label.grid(row=index + 1, column=0, padx=10, pady=5, sticky="w")
+                thumbnails.request(label, image_path, LESSON_THUMBNAIL)
 
                 label.bind("<Button-1>", lambda e, ex=exercise, img=image_file, ins=instructions: display_exercise(ex, img, ins))
 
             except Exception as e:
                 print(f"Error loading image {image_file}: {e}")
 
+        thumbnails.start()
+
     # Load exercises on startup
     load_exercises()
 
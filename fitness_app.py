@@ -1,5 +1,10 @@
+import time
+# Taken before the heavy imports so the startup trace covers them
+STARTUP_TIME = time.perf_counter()
+
 import customtkinter as ctk
-from PIL import Image, ImageTk
+from PIL import Image
+import tkinter as tk
 import tkinter.messagebox as tkmb
 import sys
 import os
@@ -9,10 +14,45 @@ import random
 import string
 import json
 import datetime
-from tkcalendar import Calendar
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import importlib.util
 import logging
+from assets import open_asset
+from dates import format_date, from_ordinal
+from downsample import lttb
+from image_cache import get_image, image_cache
+from records import Goal, Measurement, Workout, workout_metrics
+from screen_pool import ScreenPool
+from storage import get_repository
+from virtual_list import VirtualList
+from warmup import Task, WarmUp, import_modules, open_data_store, warm_images
+
+FITNESS_MESSAGES = [
+    "Stay fit, stay healthy!",
+    "Push your limits!",
+    "Every workout counts!",
+    "Stronger every day!",
+    "Your only limit is you!",
+    "Believe in yourself!",
+    "Commit to be fit!",
+    "Fitness is a journey, not a destination.",
+    "Consistency is key!",
+    "Make every rep count!"
+]
+
+# Icons and pictures the screens after login draw, decoded at the sizes they use while the splash is up
+STARTUP_IMAGES = [
+    ("img/arrow.png", (20, 20)),
+    ("img/ketani.jpg", (800, 400)),
+    ("img/icons-back.png", None),
+    ("img/back-icon.png", (50, 50)),
+    ("img/male.png", (40, 40)),
+    ("img/female.png", (40, 40)),
+    ("img/weight.png", (20, 20)),
+    ("img/height.png", (20, 20)),
+    ("img/age.png", (20, 20)),
+    ("icons/welcome_icon.png", None),
+    ("icons/logo2.png", None),
+] + [(f"icons/{name}.png", None) for name in ("overview", "workouts", "progress", "history", "settings", "logout")]
 
 class FitnessApp:
     def __init__(self):
@@ -96,8 +136,9 @@ class SplashScreen:
 
         # Load logo
         try:
-            logo_image = Image.open("icons/logo.jpg")
-            logo_image.thumbnail((600, 400))
+            with open_asset("icons/logo.jpg") as f:
+                logo_image = Image.open(f)
+                logo_image.thumbnail((600, 400))
             self.logo_photo = ctk.CTkImage(light_image=logo_image, dark_image=logo_image)
             self.logo_label = ctk.CTkLabel(self.center_frame, image=self.logo_photo, text="")
             self.logo_label.pack(pady=(0, 20))
@@ -115,7 +156,7 @@ class SplashScreen:
 
         self.message_label = ctk.CTkLabel(
             self.center_frame,
-            text="",
+            text=random.choice(FITNESS_MESSAGES),
             font=("Helvetica", 16),
             text_color="black"
         )
@@ -139,31 +180,26 @@ class SplashScreen:
         )
         self.version_label.place(relx=0.95, rely=0.98, anchor="se")
 
-        # Start loading animation
-        self.load_animation()
-
-    def load_animation(self, step=0):
-        fitness_messages = [
-            "Stay fit, stay healthy!",
-            "Push your limits!",
-            "Every workout counts!",
-            "Stronger every day!",
-            "Your only limit is you!",
-            "Believe in yourself!",
-            "Commit to be fit!",
-            "Fitness is a journey, not a destination.",
-            "Consistency is key!",
-            "Make every rep count!"
-        ]
-
-        if step < 100:
-            self.progress_bar.set((step + 1) / 100)
-            self.message_label.configure(text=random.choice(fitness_messages))
-            self.master.after(30, self.load_animation, step + 1)
-        else:
-            self.master.after(500, self.finish_splash)
+        # Idle callbacks run after Tk's pending redraws, so this fires once the splash is painted
+        self.master.after_idle(trace_startup, "first splash frame")
+
+        # The progress bar counts real start-up work; login appears once the data store is ready
+        self.finished = False
+        self.warm_up = WarmUp(self.master, [
+            Task("Opening your data", open_data_store, on_thread=False, critical=True),
+            Task("Preparing icons", lambda: warm_images(STARTUP_IMAGES), on_thread=True, critical=False),
+            Task("Loading charts", lambda: import_modules("charts", "matplotlib.figure", "matplotlib.backends.backend_agg"), on_thread=True, critical=False),
+            Task("Loading calendar", lambda: import_modules("tkcalendar"), on_thread=True, critical=False),
+        ], self.show_progress, self.finish_splash)
+        self.warm_up.start()
+
+    def show_progress(self, done, total, description):
+        if self.finished:
+            return
+        self.progress_bar.set(done / total)
 
     def finish_splash(self):
+        self.finished = True
         # Clear splash screen contents
         for widget in self.master.winfo_children():
             widget.destroy()
@@ -249,26 +285,16 @@ class LoginScreen:
 
     def validate_login(self, email, password):
         try:
-            with open("FitnessTrackerData.txt", "r") as file:
-                for line in file:
-                    if f"Email: {email}" in line and f"Password: {hashlib.sha256(password.encode()).hexdigest()}" in line:
-                        return True
-        except FileNotFoundError:
-            logging.error("FitnessTrackerData.txt not found")
+            return get_repository().validate_login(email, hashlib.sha256(password.encode()).hexdigest())
+        except Exception as e:
+            logging.error(f"Error reading user data: {e}")
         return False
 
     def get_user_data(self, email):
         try:
-            with open("FitnessTrackerData.txt", "r") as file:
-                for line in file:
-                    if f"Email: {email}" in line:
-                        parts = line.strip().split(", ")
-                        return {
-                            'name': parts[0].split(": ")[1],
-                            'email': email
-                        }
-        except FileNotFoundError:
-            logging.error("FitnessTrackerData.txt not found")
+            return get_repository().get_user(email)
+        except Exception as e:
+            logging.error(f"Error reading user data: {e}")
         return None
 
     def forgot_password(self, event=None):
@@ -286,9 +312,8 @@ class LoginScreen:
 
     def email_exists(self, email):
         try:
-            with open("FitnessTrackerData.txt", "r") as file:
-                return any(f"Email: {email}" in line for line in file)
-        except FileNotFoundError:
+            return get_repository().user_exists(email)
+        except Exception:
             return False
 
     def destroy(self):
@@ -300,12 +325,12 @@ class RegisterScreen:
         self.register_callback = register_callback
 
         # Create main frame
-        self.frame = ctk.CTkFrame(master, corner_radius=15, fg_color="#f0f0f0")
-        self.frame.pack(expand=True, fill="both", padx=20, pady=20)
+        self.main_frame = ctk.CTkFrame(master, corner_radius=15, fg_color="#f0f0f0")
+        self.main_frame.pack(expand=True, fill="both", padx=20, pady=20)
 
         # Title
         self.label_reg = ctk.CTkLabel(
-            self.frame,
+            self.main_frame,
             text="Register",
             font=("Helvetica", 24, "bold"),
             text_color="#333333"
@@ -314,7 +339,7 @@ class RegisterScreen:
 
         # Entry fields
         self.name_entry = ctk.CTkEntry(
-            self.frame,
+            self.main_frame,
             placeholder_text="Full Name",
             width=300,
             fg_color="#ffffff"
@@ -322,7 +347,7 @@ class RegisterScreen:
         self.name_entry.pack(pady=12)
 
         self.email_entry = ctk.CTkEntry(
-            self.frame,
+            self.main_frame,
             placeholder_text="Email",
             width=300,
             fg_color="#ffffff"
@@ -330,7 +355,7 @@ class RegisterScreen:
         self.email_entry.pack(pady=12)
 
         # Password frame with visibility toggle
-        self.pass_frame = ctk.CTkFrame(self.frame, fg_color="#f0f0f0")
+        self.pass_frame = ctk.CTkFrame(self.main_frame, fg_color="#f0f0f0")
         self.pass_frame.pack(pady=12, fill="x", padx=20)
 
         self.pass_entry = ctk.CTkEntry(
@@ -351,7 +376,7 @@ class RegisterScreen:
         self.pass_visibility_icon.pack(side="right", padx=(5, 0))
 
         # Confirm password frame
-        self.confirm_pass_frame = ctk.CTkFrame(self.frame, fg_color="#f0f0f0")
+        self.confirm_pass_frame = ctk.CTkFrame(self.main_frame, fg_color="#f0f0f0")
         self.confirm_pass_frame.pack(pady=12, fill="x", padx=20)
 
         self.confirm_pass_entry = ctk.CTkEntry(
@@ -364,14 +389,14 @@ class RegisterScreen:
         self.confirm_pass_entry.pack(side="left", fill="x", expand=True)
 
         # Password strength indicator
-        self.password_strength = ctk.CTkProgressBar(self.frame, width=300)
+        self.password_strength = ctk.CTkProgressBar(self.main_frame, width=300)
         self.password_strength.pack(pady=5)
         self.password_strength.set(0)
 
         # Terms and conditions checkbox
         self.terms_var = ctk.BooleanVar()
         self.terms_checkbox = ctk.CTkCheckBox(
-            self.frame,
+            self.main_frame,
             text="I agree to the Terms and Conditions",
             variable=self.terms_var
         )
@@ -379,7 +404,7 @@ class RegisterScreen:
 
         # Register button
         self.register_button = ctk.CTkButton(
-            self.frame,
+            self.main_frame,
             text="Register",
             command=self.register,
             width=200,
@@ -465,11 +490,10 @@ class RegisterScreen:
 
     def save_user_data(self, full_name, email, password):
         hashed_password = hashlib.sha256(password.encode()).hexdigest()
-        with open("FitnessTrackerData.txt", "a") as file:
-            file.write(f"Full Name: {full_name}, Email: {email}, Password: {hashed_password}\n")
+        get_repository().add_user(full_name, email, hashed_password)
 
     def destroy(self):
-        self.frame.destroy()
+        self.main_frame.destroy()
 
 class WelcomeScreen:
     def __init__(self, master, user_data, next_callback):
@@ -514,9 +538,7 @@ class WelcomeScreen:
 
         # Get Started button with arrow
         try:
-            arrow_image = Image.open("img/arrow.png")
-            arrow_image = arrow_image.resize((20, 20))
-            self.arrow_image_tk = ImageTk.PhotoImage(arrow_image)
+            self.arrow_image_tk = get_image("img/arrow.png", (20, 20), "photo")
             
             start_button = ctk.CTkButton(
                 left_frame,
@@ -549,9 +571,7 @@ class WelcomeScreen:
 
         try:
             # Load and display main image
-            image = Image.open("img/ketani.jpg")
-            image = image.resize((800, 400))
-            self.img = ImageTk.PhotoImage(image)
+            self.img = get_image("img/ketani.jpg", (800, 400), "photo")
             
             image_label = ctk.CTkLabel(right_frame, image=self.img, text="")
             image_label.pack(pady=20)
@@ -578,10 +598,11 @@ class WelcomeScreen:
         self.main_frame.destroy()
 
 class SetGoalsScreen:
-    def __init__(self, master, user_data, next_callback):
+    def __init__(self, master, user_data, next_callback, back_callback=None):
         self.master = master
         self.user_data = user_data
         self.next_callback = next_callback
+        self.back_callback = back_callback
         self.selected_fitness_goal = None
         self.selected_focus_areas = []
         self.checkboxes = {}
@@ -599,8 +620,7 @@ class SetGoalsScreen:
 
         # Back button
         try:
-            back_image = Image.open("img/icons-back.png").resize((30, 30), Image.LANCZOS)
-            self.back_icon = ctk.CTkImage(back_image, size=(30, 30))
+            self.back_icon = get_image("img/icons-back.png", (30, 30))
             back_button = ctk.CTkButton(
                 self.main_frame,
                 image=self.back_icon,
@@ -641,8 +661,7 @@ class SetGoalsScreen:
 
         # Back button
         try:
-            back_image = Image.open("img/icons-back.png").resize((30, 30), Image.LANCZOS)
-            self.back_icon = ctk.CTkImage(back_image, size=(30, 30))
+            self.back_icon = get_image("img/icons-back.png", (30, 30))
             back_button = ctk.CTkButton(
                 self.main_frame,
                 image=self.back_icon,
@@ -704,19 +723,20 @@ class SetGoalsScreen:
         self.user_data['focus_areas'] = self.selected_focus_areas
 
         # Save to file
-        with open("FitnessTrackerData.txt", "a") as file:
-            file.write(
-                f"Email: {self.user_data['email']}, "
-                f"Fitness Goal: {self.selected_fitness_goal}, "
-                f"Focus Areas: {', '.join(self.selected_focus_areas)}\n"
+        try:
+            get_repository().add_goal(
+                Goal(self.user_data['email'], self.selected_fitness_goal, self.selected_focus_areas)
             )
+        except OSError as e:
+            tkmb.showerror("Error", f"Could not save your goals: {e}")
+            return
 
         # Proceed to next screen
         self.next_callback()
 
     def go_back(self):
-        # Implementation depends on your navigation needs
-        pass
+        if self.back_callback:
+            self.back_callback()
 
     def destroy(self):
         self.main_frame.destroy()
@@ -744,17 +764,17 @@ class MeasurementsScreen:
     def load_icons(self):
         try:
             # Load back icon
-            self.logo_image = Image.open("./img/back-icon.png").resize((50, 50))
-            self.logo_image_tk = ImageTk.PhotoImage(self.logo_image)
+            self.logo_image = get_image("./img/back-icon.png", (50, 50), "pil")
+            self.logo_image_tk = get_image("./img/back-icon.png", (50, 50), "photo")
             
             # Load gender icons
-            self.male_icon = ImageTk.PhotoImage(Image.open("./img/male.png").resize((40, 40)))
-            self.female_icon = ImageTk.PhotoImage(Image.open("./img/female.png").resize((40, 40)))
+            self.male_icon = get_image("./img/male.png", (40, 40), "photo")
+            self.female_icon = get_image("./img/female.png", (40, 40), "photo")
             
             # Load measurement icons
-            self.weight_icon = ImageTk.PhotoImage(Image.open("./img/weight.png").resize((20, 20)))
-            self.height_icon = ImageTk.PhotoImage(Image.open("./img/height.png").resize((20, 20)))
-            self.age_icon = ImageTk.PhotoImage(Image.open("./img/age.png").resize((20, 20)))
+            self.weight_icon = get_image("./img/weight.png", (20, 20), "photo")
+            self.height_icon = get_image("./img/height.png", (20, 20), "photo")
+            self.age_icon = get_image("./img/age.png", (20, 20), "photo")
             
             logging.info("All icons loaded successfully")
         except Exception as e:
@@ -950,22 +970,30 @@ class MeasurementsScreen:
 
         except ValueError as e:
             tkmb.showerror("Input Error", f"Invalid input: {e}")
+        except OSError as e:
+            tkmb.showerror("Error", f"Could not save your measurements: {e}")
 
     def save_measurements(self, weight, height, bmi, category, gender, age):
-        with open("FitnessTrackerData.txt", "a") as file:
-            file.write(
-                f"Email: {self.email}, "
-                f"Weight: {weight} kg, "
-                f"Height: {height} m, "
-                f"BMI: {bmi:.2f}, "
-                f"Category: {category}, "
-                f"Gender: {gender}, "
-                f"Age: {age} |\n"
-            )
+        get_repository().add_measurement(
+            Measurement(self.email, weight, height, bmi, category, gender, age, datetime.date.today())
+        )
 
     def destroy(self):
         self.main_frame.destroy()
 
+# The data each dashboard tab shows; a tab is rebuilt only once one of these has changed
+TAB_DATA = {
+    "overview": (),
+    "workouts": (),
+    "progress": ("workouts", "measurements"),
+    "history": ("workouts",),
+    "settings": (),
+}
+
+# Built while the member is on another tab, slowest first
+PREBUILT_TABS = ("progress", "workouts", "history")
+PREBUILD_DELAY_MS = 300
+
 class DashboardScreen:
     def __init__(self, master, user_data, logout_callback):
         self.master = master
@@ -975,7 +1003,18 @@ class DashboardScreen:
         # Initialize variables
         self.nav_buttons = []
         self.current_content = None
+        # Built on first use and kept across tab switches
+        self.weight_chart = None
         self.notification_var = ctk.StringVar()
+
+        # Each tab's frame is built once and kept, with the data versions it was built from
+        self.tabs = {}
+        self.tab_versions = {}
+        self.tab_layouts = {}
+        self.current_tab = None
+        self.data_versions = {"workouts": 0, "measurements": 0}
+        self.prebuild_job = None
+        self.progress_chart = False
         
         # Configure the window
         self.master.title("Titan Fitness Tracker/Dashboard")
@@ -985,13 +1024,18 @@ class DashboardScreen:
         
         # Show default content (overview)
         self.show_overview()
+        self.schedule_prebuild()
 
     def create_layout(self):
+        # Everything the dashboard shows lives in one frame, so it can be hidden and reshown whole
+        self.main_frame = ctk.CTkFrame(self.master, fg_color="transparent")
+        self.main_frame.pack(fill="both", expand=True)
+
         # Welcome header
         self.create_welcome_header()
         
         # Create main container
-        self.main_container = ctk.CTkFrame(self.master)
+        self.main_container = ctk.CTkFrame(self.main_frame)
         self.main_container.pack(fill="both", expand=True)
         
         # Create sidebar
@@ -1003,15 +1047,12 @@ class DashboardScreen:
 
     def create_welcome_header(self):
         try:
-            welcome_icon = ctk.CTkImage(
-                light_image=Image.open("icons/welcome_icon.png"),
-                size=(20, 20)
-            )
+            welcome_icon = get_image("icons/welcome_icon.png", (20, 20))
         except Exception:
             welcome_icon = None
 
         welcome_label = ctk.CTkLabel(
-            self.master,
+            self.main_frame,
             text=f"Welcome, {self.user_data.get('name', 'User')}!",
             font=("Helvetica", 16),
             image=welcome_icon,
@@ -1035,10 +1076,7 @@ class DashboardScreen:
         profile_frame.pack(fill="x")
 
         try:
-            profile_icon = ctk.CTkImage(
-                light_image=Image.open("icons/logo2.png"),
-                size=(80, 80)
-            )
+            profile_icon = get_image("icons/logo2.png", (80, 80))
             profile_picture = ctk.CTkLabel(
                 profile_frame,
                 image=profile_icon,
@@ -1067,10 +1105,7 @@ class DashboardScreen:
 
         for text, command in nav_items:
             try:
-                icon = ctk.CTkImage(
-                    light_image=Image.open(f"icons/{text.lower()}.png"),
-                    size=(20, 20)
-                )
+                icon = get_image(f"icons/{text.lower()}.png", (20, 20))
             except Exception:
                 icon = None
 
@@ -1086,15 +1121,99 @@ class DashboardScreen:
             button.pack(pady=10, padx=10, fill="x")
             self.nav_buttons.append(button)
 
-    def clear_content(self):
-        if self.current_content:
-            self.current_content.destroy()
-        self.current_content = ctk.CTkFrame(self.content_frame, fg_color="white")
-        self.current_content.pack(fill="both", expand=True)
-
     def show_overview(self):
-        self.clear_content()
-        
+        self.show_tab("overview")
+
+    def show_workouts(self):
+        self.show_tab("workouts")
+
+    def show_progress(self):
+        self.show_tab("progress")
+
+    def show_history(self):
+        self.show_tab("history")
+
+    def show_settings(self):
+        self.show_tab("settings")
+
+    def show_tab(self, name):
+        """Show a tab, building it only if it was never built or its data has changed since"""
+        if self.current_tab is not None:
+            self.tabs[self.current_tab].pack_forget()
+        if self.weight_chart:
+            self.weight_chart.hide()
+
+        if name in self.tabs and self.tab_versions[name] != self.tab_version(name):
+            self.discard_tab(name)
+        if name not in self.tabs:
+            self.build_tab(name)
+
+        self.current_content = self.tabs[name]
+        self.current_content.pack(**self.tab_layouts[name])
+        self.current_tab = name
+        if name == "progress" and self.progress_chart:
+            # The chart frame is shared by every Progress build, so it sits beside the tab
+            self.weight_chart.show(pady=20, fill="both", expand=True)
+
+    def tab_version(self, name):
+        return tuple(self.data_versions[data] for data in TAB_DATA[name])
+
+    def build_tab(self, name):
+        # Built unpacked, so a background build doesn't appear over the current tab
+        frame = self.current_content = ctk.CTkFrame(self.content_frame, fg_color="white")
+        self.tab_layouts[name] = {"fill": "both", "expand": True}
+        version = self.tab_version(name)
+        try:
+            getattr(self, f"build_{name}")()
+        except Exception:
+            # A half-built tab is never kept; the next visit builds it again
+            frame.destroy()
+            raise
+        finally:
+            self.current_content = self.tabs.get(self.current_tab)
+        self.tabs[name] = frame
+        self.tab_versions[name] = version
+
+    def discard_tab(self, name):
+        self.tabs.pop(name).destroy()
+        self.tab_versions.pop(name, None)
+        if name == self.current_tab:
+            self.current_tab = None
+
+    def data_changed(self, *data):
+        """Move the given data versions on; only the tabs showing that data are rebuilt"""
+        for kind in data:
+            self.data_versions[kind] += 1
+        self.schedule_prebuild()
+
+    def schedule_prebuild(self):
+        if self.prebuild_job is None:
+            self.prebuild_job = self.master.after(PREBUILD_DELAY_MS, self.prebuild_next)
+
+    def prebuild_next(self):
+        """Build one stale or missing expensive tab per idle slot, so the current tab stays responsive"""
+        self.prebuild_job = None
+        try:
+            for name in PREBUILT_TABS:
+                if name == self.current_tab:
+                    continue
+                if name in self.tabs and self.tab_versions[name] == self.tab_version(name):
+                    continue
+                if name in self.tabs:
+                    self.discard_tab(name)
+                try:
+                    self.build_tab(name)
+                except Exception as e:
+                    # Built again when the member opens it
+                    logging.error(f"Error building the {name} tab in the background: {e}")
+                    continue
+                self.schedule_prebuild()
+                return
+        except tk.TclError:
+            # The dashboard was destroyed meanwhile
+            pass
+
+    def build_overview(self):
         # Create overview widgets
         title = ctk.CTkLabel(
             self.current_content,
@@ -1130,9 +1249,7 @@ class DashboardScreen:
                 font=ctk.CTkFont(size=16, weight="bold")
             ).pack(pady=5)
 
-    def show_workouts(self):
-        self.clear_content()
-        
+    def build_workouts(self):
         title = ctk.CTkLabel(
             self.current_content,
             text="Workout Planner",
@@ -1140,7 +1257,8 @@ class DashboardScreen:
         )
         title.pack(pady=20)
 
-        # Calendar widget
+        # Calendar widget; tkcalendar is only imported once the planner is opened
+        from tkcalendar import Calendar
         calendar = Calendar(self.current_content)
         calendar.pack(pady=20)
 
@@ -1178,16 +1296,15 @@ class DashboardScreen:
             form_frame,
             text="Save Workout",
             command=lambda: self.save_workout(
-                calendar.get_date(),
+                calendar.selection_get(),
                 workout_var.get(),
                 duration_entry.get()
             )
         )
         save_button.pack(pady=20)
 
-    def show_progress(self):
-        self.clear_content()
-        
+    def build_progress(self):
+        self.progress_chart = False
         title = ctk.CTkLabel(
             self.current_content,
             text="Progress Tracking",
@@ -1195,26 +1312,47 @@ class DashboardScreen:
         )
         title.pack(pady=20)
 
-        # Create matplotlib figure
-        fig, ax = plt.subplots(figsize=(8, 6))
-        
-        # Sample data - replace with actual tracking data
-        dates = ["Jan", "Feb", "Mar", "Apr", "May"]
-        weights = [75, 74, 73, 72, 71]
-        
-        ax.plot(dates, weights, marker='o')
+        measurements = get_repository().get_measurements(self.user_data['email'])
+        if not measurements:
+            ctk.CTkLabel(
+                self.current_content,
+                text="No measurements recorded yet."
+            ).pack(pady=20)
+            return
+
+        # One figure for the life of the dashboard; later visits only replace the line's data
+        if self.weight_chart is None:
+            # The chart imports matplotlib and builds its figure on the render worker
+            from charts import LineChart
+            self.weight_chart = LineChart(
+                self.content_frame, self.user_data['email'], decorate=self.decorate_weight_chart, fg_color="white"
+            )
+
+        # Measurements saved before dates were recorded can only be plotted in order
+        dated = all(m.date is not None for m in measurements)
+        xs = [m.date if dated else number for number, m in enumerate(measurements, 1)]
+        weights = [m.weight for m in measurements]
+
+        # No more points than the canvas has pixel columns, however long the history
+        xs, weights = lttb(xs, weights, self.weight_chart.pixel_width)
+        if dated:
+            xs = [from_ordinal(x) for x in xs]
+
+        # The title stays at the top and the chart takes the rest of the page
+        self.tab_layouts["progress"] = {"fill": "x", "expand": False}
+        self.progress_chart = True
+
+        # Drawn on the render worker; an unchanged history is shown from the render cache
+        version = hash((tuple(xs), tuple(weights)))
+        self.weight_chart.plot(version, xs, weights, dated)
+
+    def decorate_weight_chart(self, ax):
         ax.set_title("Weight Progress")
-        ax.set_xlabel("Month")
+        ax.set_xlabel("Date" if self.weight_chart.dated else "Measurement")
         ax.set_ylabel("Weight (kg)")
-        
-        # Embed plot in tkinter
-        canvas = FigureCanvasTkAgg(fig, self.current_content)
-        canvas.draw()
-        canvas.get_tk_widget().pack(pady=20)
+        ax.figure.autofmt_xdate()
 
-    def show_history(self):
-        self.clear_content()
-        
+    def build_history(self):
         title = ctk.CTkLabel(
             self.current_content,
             text="Workout History",
@@ -1222,26 +1360,22 @@ class DashboardScreen:
         )
         title.pack(pady=20)
 
-        # Create scrollable text widget
-        history_text = ctk.CTkTextbox(
+        # Only the rows on screen get widgets; pages are fetched as the list scrolls
+        email = self.user_data['email']
+        repo = get_repository()
+        history_list = VirtualList(
             self.current_content,
+            lambda offset, limit: repo.get_workouts_at(email, offset, limit),
+            repo.count_workouts(email),
+            lambda workout: f"{format_date(workout.date)}: {workout.exercise} - {workout.duration} minutes",
+            empty_text="No workout history found.",
             width=400,
             height=300
         )
-        history_text.pack(pady=20, padx=20)
+        history_list.pack(pady=20, padx=20, fill="both", expand=True)
 
-        # Load workout history
-        try:
-            with open("workout_history.txt", "r") as file:
-                history = file.read()
-                history_text.insert("1.0", history)
-        except FileNotFoundError:
-            history_text.insert("1.0", "No workout history found.")
-        
-        history_text.configure(state="disabled")
-
-    def show_settings(self):
-        self.clear_content()
+    def build_settings(self):
+        settings = get_repository().get_settings(self.user_data['email']) or {}
         
         title = ctk.CTkLabel(
             self.current_content,
@@ -1280,37 +1414,54 @@ class DashboardScreen:
             text="Notifications:"
         ).pack(side="left", padx=10)
         
-        notif_var = ctk.BooleanVar(value=True)
+        self.notif_var = ctk.BooleanVar(value=settings.get('notifications', True))
         notif_switch = ctk.CTkSwitch(
             notif_frame,
             text="Enable",
-            variable=notif_var,
+            variable=self.notif_var,
             command=self.toggle_notifications
         )
         notif_switch.pack(side="right", padx=10)
 
     def save_workout(self, date, workout_type, duration):
+        # selection_get() is None until a day is picked
+        if date is None:
+            tkmb.showerror("Error", "Please select a date")
+            return
         try:
             duration = int(duration)
-            with open("workout_history.txt", "a") as file:
-                file.write(f"{date}: {workout_type} - {duration} minutes\n")
+            get_repository().add_workout(
+                Workout(self.user_data['email'], workout_type, date, duration, *workout_metrics(duration))
+            )
+            self.data_changed("workouts")
             tkmb.showinfo("Success", "Workout saved successfully!")
         except ValueError:
             tkmb.showerror("Error", "Please enter a valid duration")
+        except OSError as e:
+            tkmb.showerror("Error", f"Could not save workout: {e}")
 
     def change_theme(self, new_theme):
         ctk.set_appearance_mode(new_theme)
+        self.update_settings(theme=new_theme.lower())
 
     def toggle_notifications(self):
-        # Implement notification toggle functionality
-        pass
+        self.update_settings(notifications=self.notif_var.get())
+
+    def update_settings(self, **changes):
+        try:
+            get_repository().update_settings(self.user_data['email'], changes)
+        except Exception as e:
+            logging.error(f"Error saving user settings: {e}")
 
     def logout(self):
         if tkmb.askyesno("Logout", "Are you sure you want to logout?"):
             self.logout_callback()
 
     def destroy(self):
-        self.master.destroy()
+        if self.prebuild_job is not None:
+            self.master.after_cancel(self.prebuild_job)
+            self.prebuild_job = None
+        self.main_frame.destroy()
 
 class FitnessTrackerApp:
     def __init__(self):
@@ -1327,6 +1478,10 @@ class FitnessTrackerApp:
         
         # Initialize data files
         self.initialize_data_files()
+
+        # Visited screens are hidden rather than destroyed, so going back to one is instant
+        self.current_screen = None
+        self.screens = ScreenPool(self.root)
         
         # Start with splash screen
         self.show_splash()
@@ -1337,9 +1492,7 @@ class FitnessTrackerApp:
     def initialize_data_files(self):
         """Initialize necessary data files if they don't exist"""
         required_files = [
-            "FitnessTrackerData.txt",
-            "workout_history.txt",
-            "user_settings.json"
+            "FitnessTrackerData.txt"
         ]
         
         for file in required_files:
@@ -1362,33 +1515,50 @@ class FitnessTrackerApp:
 
     def show_login(self):
         """Show login screen"""
-        self.clear_current_screen()
-        self.current_screen = LoginScreen(self.root, self.handle_login, self.show_register)
+        self.show_screen("login", lambda: LoginScreen(self.root, self.handle_login, self.show_register))
 
     def show_register(self):
         """Show registration screen"""
-        self.clear_current_screen()
-        self.current_screen = RegisterScreen(self.root, self.handle_registration)
+        self.show_screen("register", lambda: RegisterScreen(self.root, self.handle_registration))
 
     def show_welcome(self, user_data):
         """Show welcome screen"""
-        self.clear_current_screen()
-        self.current_screen = WelcomeScreen(self.root, user_data, lambda: self.show_goals(user_data))
+        self.show_screen("welcome", lambda: WelcomeScreen(self.root, user_data, lambda: self.show_goals(user_data)))
 
     def show_goals(self, user_data):
         """Show goals selection screen"""
-        self.clear_current_screen()
-        self.current_screen = SetGoalsScreen(self.root, user_data, lambda: self.show_measurements(user_data))
+        self.show_screen("goals", lambda: SetGoalsScreen(
+            self.root, user_data,
+            lambda: self.user_data_changed(lambda: self.show_measurements(user_data)),
+            lambda: self.show_welcome(user_data)
+        ))
 
     def show_measurements(self, user_data):
         """Show measurements screen"""
-        self.clear_current_screen()
-        self.current_screen = MeasurementsScreen(self.root, user_data, lambda: self.show_dashboard(user_data))
+        self.show_screen("measurements", lambda: MeasurementsScreen(
+            self.root, user_data, lambda: self.user_data_changed(lambda: self.show_dashboard(user_data))
+        ))
 
     def show_dashboard(self, user_data):
         """Show main dashboard"""
-        self.clear_current_screen()
-        self.current_screen = DashboardScreen(self.root, user_data, self.handle_logout)
+        self.show_screen("dashboard", lambda: DashboardScreen(self.root, user_data, self.handle_logout))
+
+    def show_screen(self, name, build):
+        """Show a screen from the pool, building it only if it isn't kept alive already"""
+        # The splash screen isn't pooled
+        if self.current_screen is not None and self.current_screen not in self.screens:
+            self.clear_current_screen()
+        self.current_screen = self.screens.show(name, build)
+
+    def user_data_changed(self, next_screen):
+        """The member saved goals or measurements: rebuild the screens that show them, then go on"""
+        self.screens.invalidate("dashboard")
+        next_screen()
+
+    def reset_screens(self):
+        """Destroy every pooled screen, e.g. when a different member logs in"""
+        self.screens.invalidate()
+        self.current_screen = None
 
     def clear_current_screen(self):
         """Clear the current screen if it exists"""
@@ -1403,6 +1573,8 @@ class FitnessTrackerApp:
         """Handle successful login"""
         try:
             self.load_user_settings(user_data['email'])
+            # Nothing built for the previous member (or the typed password) is kept
+            self.reset_screens()
             self.show_welcome(user_data)
         except Exception as e:
             logging.error(f"Error handling login: {e}")
@@ -1412,6 +1584,7 @@ class FitnessTrackerApp:
         """Handle successful registration"""
         try:
             self.create_user_settings(user_data['email'])
+            self.reset_screens()
             self.show_welcome(user_data)
         except Exception as e:
             logging.error(f"Error handling registration: {e}")
@@ -1421,34 +1594,29 @@ class FitnessTrackerApp:
         """Handle user logout"""
         try:
             self.save_user_settings()
+            self.reset_screens()
             self.show_login()
         except Exception as e:
             logging.error(f"Error handling logout: {e}")
             tkmb.showerror("Error", "An error occurred during logout")
 
     def load_user_settings(self, email):
-        """Load user settings from JSON file"""
+        """Load user settings from storage"""
         try:
-            with open("user_settings.json", 'r') as f:
-                settings = json.load(f)
-                if email in settings:
-                    user_settings = settings[email]
-                    ctk.set_appearance_mode(user_settings.get('theme', 'light'))
+            user_settings = get_repository().get_settings(email)
+            if user_settings:
+                ctk.set_appearance_mode(user_settings.get('theme', 'light'))
         except Exception as e:
             logging.error(f"Error loading user settings: {e}")
 
     def create_user_settings(self, email):
         """Create default settings for new user"""
         try:
-            with open("user_settings.json", 'r+') as f:
-                settings = json.load(f)
-                settings[email] = {
-                    'theme': 'light',
-                    'notifications': True,
-                    'reminders': True
-                }
-                f.seek(0)
-                json.dump(settings, f)
+            get_repository().update_settings(email, {
+                'theme': 'light',
+                'notifications': True,
+                'reminders': True
+            })
         except Exception as e:
             logging.error(f"Error creating user settings: {e}")
 
@@ -1469,42 +1637,52 @@ def setup_logging():
     )
 
 def check_dependencies():
-    """Check if all required dependencies are available"""
-    required_packages = [
-        'customtkinter',
-        'pillow',
-        'tkcalendar',
-        'matplotlib'
+    """Check if all required dependencies are available, without importing them"""
+    # pip name -> module name
+    required_packages = {
+        'customtkinter': 'customtkinter',
+        'pillow': 'PIL',
+        'tkcalendar': 'tkcalendar',
+        'matplotlib': 'matplotlib'
+    }
+
+    missing_packages = [
+        package for package, module in required_packages.items()
+        if importlib.util.find_spec(module) is None
     ]
-    
-    missing_packages = []
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            missing_packages.append(package)
-    
+
     if missing_packages:
         print("Missing required packages:", ", ".join(missing_packages))
         print("Please install them using: pip install", " ".join(missing_packages))
         return False
     return True
 
+def trace_startup(stage):
+    """Log how long after launch a startup stage was reached
+
+    For a per-module breakdown of the imports, run
+    python -X importtime fitness_app.py 2> importtime.log
+    """
+    logging.info(f"Startup: {stage} after {(time.perf_counter() - STARTUP_TIME) * 1000:.0f} ms")
+
 def main():
     """Main entry point of the application"""
     try:
         # Set up logging
         setup_logging()
+        trace_startup("imports done")
         
         # Check dependencies
         if not check_dependencies():
             return
+        trace_startup("dependencies checked")
         
         # Log application start
         logging.info("Starting Fitness Tracker Application")
         
         # Create and start the application
         app = FitnessTrackerApp()
+        logging.info(f"Image cache: {image_cache.summary()}")
         
     except Exception as e:
         logging.error(f"Fatal error: {e}")
@@ -5,7 +5,8 @@ a = Analysis(
     ['fitness_app.py'],
     pathex=[],
     binaries=[],
-    datas=[('FitnessDataTracker.txt', '.')],
+    # assets.pak is built by `python assets.py`; it replaces shipping icons/ and img/ loose
+    datas=[('FitnessDataTracker.txt', '.'), ('assets.pak', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,108 @@
+import os
+import threading
+from collections import OrderedDict
+import customtkinter as ctk
+from PIL import Image, ImageTk
+from assets import open_asset
+
+# Decoded pixels the cache may hold before evicting; TITANS_IMAGE_CACHE_BYTES overrides it
+IMAGE_CACHE_BUDGET = int(os.environ.get("TITANS_IMAGE_CACHE_BYTES", 32 * 1024 * 1024))
+
+# What get() returns: a resized PIL image, a CTkImage, or a Tk PhotoImage
+MODES = ("pil", "ctk", "photo")
+
+
+def image_bytes(image):
+    return image.width * image.height * len(image.getbands())
+
+
+class ImageCache:
+    """Decoded icons and pictures shared across screens, keyed by (path, size, mode)
+
+    The same object comes back for the same key, so revisiting a screen
+    neither reads the file nor decodes it again. The least recently used
+    entries are evicted once the decoded size passes budget bytes.
+    """
+
+    def __init__(self, budget=IMAGE_CACHE_BUDGET):
+        self.budget = budget
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, path, size=None, mode="ctk"):
+        key = (path, tuple(size) if size else None, mode)
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                self.entries[key] = entry
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        image, nbytes = self.load(path, key[1], mode)
+        with self.lock:
+            if key in self.entries:
+                # Another thread loaded the same image meanwhile; keep the one already handed out
+                return self.entries[key][0]
+            self.entries[key] = (image, nbytes)
+            self.bytes += nbytes
+            # Always keep the entry just added, even if it alone is over budget
+            while self.bytes > self.budget and len(self.entries) > 1:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+        return image
+
+    def load(self, path, size, mode):
+        # ctk and photo entries wrap a cached "pil" entry, which already carries the charge
+        if mode == "ctk":
+            # CTkImage scales the original itself for the window's DPI
+            source = self.get(path, None, "pil")
+            return ctk.CTkImage(light_image=source, size=size or source.size), 0
+        if mode == "photo":
+            # Built from the cached PIL image, so one decoded ahead of time (see warmup) only needs wrapping
+            image = self.get(path, size, "pil")
+            return ImageTk.PhotoImage(image), 0
+        # From the asset archive when packed, otherwise the loose file
+        with open_asset(path) as f, Image.open(f) as source:
+            source.load()
+        image = source.resize(size, Image.LANCZOS) if size else source
+        return image, image_bytes(image)
+
+    def clear(self):
+        """Forget everything, e.g. when the Tk root the images belong to is destroyed"""
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def summary(self):
+        stats = self.stats()
+        lookups = stats["hits"] + stats["misses"]
+        hit_rate = stats["hits"] / lookups * 100 if lookups else 0.0
+        return (
+            f"{stats['entries']} images, {stats['bytes'] / 1e6:.1f} MB; "
+            f"{stats['hits']} hits / {stats['misses']} misses ({hit_rate:.0f}%), "
+            f"{stats['evictions']} evicted"
+        )
+
+
+image_cache = ImageCache()
+
+
+def get_image(path, size=None, mode="ctk"):
+    """Return the shared decoded image for (path, size, mode); see ImageCache"""
+    return image_cache.get(path, size, mode)
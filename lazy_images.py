@@ -0,0 +1,110 @@
+import logging
+import queue
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from PIL import ImageTk
+from thumbnails import get_thumbnail
+
+# Shared by every list, so opening a screen twice doesn't start more threads
+decode_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="thumbnail-decode")
+
+POLL_MS = 15
+RESCROLL_DELAY_MS = 100
+
+
+class LazyThumbnails:
+    """Fills the images of a list's labels in the background, rows in view first
+
+    Labels are created with text only and registered with request(); the
+    thumbnails are decoded on decode_pool and each finished one is handed
+    to Tk from a polling after() callback, since Tk must only be touched
+    from its own thread. Scrolling re-queues the rows that haven't started
+    decoding so the newly visible ones go next.
+    """
+
+    def __init__(self, canvas, frame):
+        self.canvas = canvas
+        self.frame = frame
+        self.requests = []
+        self.futures = {}
+        self.done = queue.Queue()
+        self.rescroll_job = None
+        self.polling = False
+
+    def request(self, label, path, size):
+        self.requests.append((label, path, size))
+
+    def start(self):
+        # Positions are only known once Tk has laid the rows out
+        self.frame.after_idle(self.submit)
+        self.canvas.bind("<Configure>", self.on_scroll, add="+")
+        self.canvas.bind("<MouseWheel>", self.on_scroll, add="+")
+
+    def distance_from_view(self, label):
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        y = label.winfo_y()
+        if y + label.winfo_height() < top:
+            return top - y
+        if y > bottom:
+            return y - bottom
+        return 0
+
+    def submit(self):
+        try:
+            waiting = [request for request in self.requests if request[0] not in self.futures]
+            # sorted() is stable, so rows at the same distance keep list order
+            waiting.sort(key=lambda request: self.distance_from_view(request[0]))
+        except tk.TclError:
+            return
+        for label, path, size in waiting:
+            self.futures[label] = decode_pool.submit(self.decode, label, path, size)
+        if not self.polling:
+            self.polling = True
+            self.frame.after(POLL_MS, self.poll)
+
+    def decode(self, label, path, size):
+        """Runs on decode_pool"""
+        try:
+            self.done.put((label, get_thumbnail(path, size)))
+        except Exception as e:
+            logging.error(f"Error loading thumbnail {path}: {e}")
+            self.done.put((label, None))
+
+    def yview(self, *args):
+        """Scrollbar command: scrolls the canvas and re-queues for the new view"""
+        self.canvas.yview(*args)
+        self.on_scroll()
+
+    def on_scroll(self, event=None):
+        if self.rescroll_job is not None:
+            self.frame.after_cancel(self.rescroll_job)
+        self.rescroll_job = self.frame.after(RESCROLL_DELAY_MS, self.reprioritise)
+
+    def reprioritise(self):
+        self.rescroll_job = None
+        for label, future in list(self.futures.items()):
+            # Only work that hasn't started can be put back in the queue
+            if future.cancel():
+                del self.futures[label]
+        self.submit()
+
+    def poll(self):
+        try:
+            while True:
+                label, image = self.done.get_nowait()
+                self.requests = [request for request in self.requests if request[0] is not label]
+                if image is not None and label.winfo_exists():
+                    photo = ImageTk.PhotoImage(image)
+                    label.configure(image=photo)
+                    label.image = photo  # Keep a reference!
+        except queue.Empty:
+            pass
+        except tk.TclError:
+            # The screen was closed; anything still decoding is dropped
+            self.polling = False
+            return
+        if self.requests:
+            self.frame.after(POLL_MS, self.poll)
+        else:
+            self.polling = False
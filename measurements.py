@@ -1,25 +1,26 @@
 import customtkinter as ctk
 from tkinter import messagebox
-import subprocess
 import sys
-from PIL import Image, ImageTk
-import dashboard  # Add this import at the top
-
-DATA_FILE = "FitnessTrackerData.txt"
-
-class FitnessApp(ctk.CTk):
-    def __init__(self, email):
-        super().__init__()
-        self.title("Titans Fitness Club - Measurements")
-        # Set the window size to full screen
-        self.geometry(f"{self.winfo_screenwidth()}x{self.winfo_screenheight()}+0+0")
+import datetime
+from image_cache import get_image
+from navigator import start
+from records import Measurement
+from storage import get_repository
+
+class MeasurementsScreen(ctk.CTkFrame):
+    def __init__(self, navigator, email):
+        # A frame filling the navigator's window, so the layout below is unchanged
+        super().__init__(navigator.root, fg_color="transparent")
+        self.pack(fill="both", expand=True)
+        self.navigator = navigator
+        navigator.set_title("Titans Fitness Club - Measurements")
 
         # Store email
         self.email = email  
 
         # Load arrow image for buttons
         try:
-            self.arrow_image = ImageTk.PhotoImage(Image.open("./img/arrow.png").resize((20, 20)))
+            self.arrow_image = get_image("./img/arrow.png", (20, 20), "photo")
             print("Arrow image loaded successfully")
         except Exception as e:
             print(f"Error loading arrow image: {e}")
@@ -27,8 +28,7 @@ class FitnessApp(ctk.CTk):
 
         # Load back icon for top-left corner
         try:
-            self.logo_image = Image.open("./img/back-icon.png").resize((50, 50))  
-            self.logo_image_tk = ImageTk.PhotoImage(self.logo_image)
+            self.logo_image_tk = get_image("./img/back-icon.png", (50, 50), "photo")
             print("Logo image loaded successfully")
         except Exception as e:
             print(f"Error loading logo image: {e}")
@@ -61,8 +61,8 @@ class FitnessApp(ctk.CTk):
 
         # Load gender icons
         try:
-            self.male_icon = ImageTk.PhotoImage(Image.open("./img/male.png").resize((40, 40)))
-            self.female_icon = ImageTk.PhotoImage(Image.open("./img/female.png").resize((40, 40)))
+            self.male_icon = get_image("./img/male.png", (40, 40), "photo")
+            self.female_icon = get_image("./img/female.png", (40, 40), "photo")
         except Exception as e:
             print(f"Error loading gender icons: {e}")
             self.male_icon = self.female_icon = None
@@ -76,9 +76,9 @@ class FitnessApp(ctk.CTk):
 
         # Load weight, height, and age icons
         try:
-            self.weight_icon = ImageTk.PhotoImage(Image.open("./img/weight.png").resize((20, 20)))
-            self.height_icon = ImageTk.PhotoImage(Image.open("./img/height.png").resize((20, 20)))
-            self.age_icon = ImageTk.PhotoImage(Image.open("./img/age.png").resize((20, 20)))
+            self.weight_icon = get_image("./img/weight.png", (20, 20), "photo")
+            self.height_icon = get_image("./img/height.png", (20, 20), "photo")
+            self.age_icon = get_image("./img/age.png", (20, 20), "photo")
         except Exception as e:
             print(f"Error loading input icons: {e}")
             self.weight_icon = self.height_icon = self.age_icon = None
@@ -106,7 +106,9 @@ class FitnessApp(ctk.CTk):
         continue_button.pack(pady=20)
 
     def go_back(self, event):
-        self.destroy()  # Close the window and return to the previous screen
+        # Return to the previous screen
+        import set_goals
+        self.navigator.show(set_goals.show_goals, self.email)
 
     def select_gender(self, gender):
         self.gender_var.set(gender)
@@ -122,7 +124,7 @@ class FitnessApp(ctk.CTk):
             weight = float(self.weight_entry.get())
             height = float(self.height_entry.get())
             gender = self.gender_var.get()
-            age = self.age_entry.get()
+            age = int(self.age_entry.get())
 
             if height <= 0:
                 raise ValueError("Height must be greater than 0")
@@ -140,9 +142,10 @@ class FitnessApp(ctk.CTk):
             else:
                 category = "Obesity"
 
-            # Save the result to a file along with the email
-            with open(DATA_FILE, "a") as file:
-                file.write(f"Email: {self.email}, Weight: {weight} kg, Height: {height} m, BMI: {bmi:.2f}, Category: {category}, Gender: {gender}, Age: {age} |\n")
+            # Save the result along with the email, where the dashboard reads it
+            get_repository().add_measurement(
+                Measurement(self.email, weight, height, bmi, category, gender, age, datetime.date.today())
+            )
 
             # Show the result to the user
             messagebox.showinfo("BMI Result", f"Your BMI is {bmi:.2f} ({category})")
@@ -152,21 +155,18 @@ class FitnessApp(ctk.CTk):
 
         except ValueError as e:
             messagebox.showerror("Input Error", f"Invalid input: {e}")
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not save your measurements: {e}")
 
     def open_logworkout(self):
-        # Create dictionary with user data
-        user_data = {
-            'email': self.email,
-            'weight': float(self.weight_entry.get()),
-            'height': float(self.height_entry.get()),
-            'bmi': float(self.weight_entry.get()) / (float(self.height_entry.get()) ** 2),
-            'gender': self.gender_var.get(),
-            'age': int(self.age_entry.get())
-        }
-        
-        # Open dashboard directly with user data
-        dashboard.DashboardApp(user_data)
-        self.destroy()
+        # Open the dashboard in the same window
+        user = get_repository().get_user(self.email)
+        import dashboard
+        self.navigator.show(dashboard.show_dashboard, self.email, user['name'] if user else "User")
+
+# Build the measurements screen into the navigator's window
+def show_measurements(navigator, email):
+    return MeasurementsScreen(navigator, email)
 
 if __name__ == "__main__": 
     if len(sys.argv) > 1 and sys.argv[1]:  # Check if email is provided
@@ -174,5 +174,4 @@ if __name__ == "__main__":
     else:
         raise ValueError("No email provided. Please register first.")  # Raise an error for clarity
 
-    app = FitnessApp(user_email)
-    app.mainloop()
+    start(show_measurements, user_email, title="Titans Fitness Club - Measurements")
@@ -0,0 +1,109 @@
+import os
+import sys
+import mmap
+from records import DATA_FILE, ParseStats, parse_records
+
+
+def member_prefixes(email):
+    """Line prefixes of a member's workout rows and of their goal/measurement lines"""
+    return (f"{email},".encode(), f"Email: {email}, ".encode())
+
+
+class MappedScanner:
+    """Memory-mapped line scanner for large data files
+
+    Lines are found with mmap.find over the mapping, and a prefix filter
+    is checked in place, so only matching lines are copied out and
+    decoded. Use as a context manager or call close().
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.size = os.fstat(self.file.fileno()).st_size
+        # mmap refuses empty files; an empty scan needs no mapping
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        self.offset = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
+
+    def lines(self, prefixes=None, start=0, end=None):
+        """Yield complete lines (as bytes, newline stripped) between two offsets
+
+        Only lines starting with one of prefixes are yielded. Afterwards
+        self.offset is just past the last complete line, so a later scan
+        can resume from there; a half-written last line is left alone.
+        """
+        end = self.size if end is None else min(end, self.size)
+        self.offset = start
+        if self.map is None:
+            return
+        find = self.map.find
+        if prefixes is None:
+            position = start
+            while position < end:
+                newline = find(b"\n", position, end)
+                if newline < 0:
+                    break
+                yield self.map[position:newline]
+                position = newline + 1
+                self.offset = position
+            return
+
+        # Jump straight to "\n<prefix>" matches so non-matching lines are never visited.
+        # hits[i] is the newline before the next line starting with prefixes[i], or -1
+        needles = [b"\n" + prefix for prefix in prefixes]
+        hits = [find(needle, start, end) for needle in needles]
+        if any(find(prefix, start, start + len(prefix)) == start for prefix in prefixes):
+            position = start
+        else:
+            position = min((hit for hit in hits if hit >= 0), default=-2) + 1
+        while position >= 0:
+            newline = find(b"\n", position, end)
+            if newline < 0:
+                break
+            yield self.map[position:newline]
+            for i, hit in enumerate(hits):
+                if 0 <= hit < newline:
+                    hits[i] = find(needles[i], newline, end)
+            position = min((hit for hit in hits if hit >= 0), default=-2) + 1
+
+        last_newline = self.map.rfind(b"\n", start, end)
+        self.offset = last_newline + 1 if last_newline >= 0 else start
+
+    def records(self, prefixes=None, start=0, end=None, stats=None):
+        """Typed records of the matching lines, as records.parse_records yields them"""
+        lines = (line.decode("utf-8", errors="replace") for line in self.lines(prefixes, start, end))
+        return parse_records(lines, stats)
+
+
+def scan_records(path=DATA_FILE, email=None, stats=None):
+    """Stream the records of a data file, limited to one member if an email is given"""
+    try:
+        scanner = MappedScanner(path)
+    except FileNotFoundError:
+        return
+    with scanner:
+        yield from scanner.records(member_prefixes(email) if email else None, stats=stats)
+
+
+def main(argv):
+    path = argv[1] if len(argv) > 1 else DATA_FILE
+    email = argv[2] if len(argv) > 2 else None
+    stats = ParseStats()
+    count = sum(1 for _ in scan_records(path, email, stats))
+    print(f"{count} records matched")
+    print(stats.summary())
+
+
+if __name__ == "__main__":
+    main(sys.argv)
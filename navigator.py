@@ -0,0 +1,42 @@
+import customtkinter as ctk
+from image_cache import image_cache
+
+
+class Navigator:
+    """One window for the standalone screens (Login.py, Register.py, welcome.py, ...)
+
+    show(screen, *args) clears the window and calls screen(navigator, *args),
+    which builds its widgets into navigator.root. Moving from one screen to
+    the next reuses the process, the Tk interpreter and the loaded modules
+    instead of starting a new Python for each.
+    """
+
+    def __init__(self, title="Titans Fitness Club"):
+        # Cached PhotoImages belong to whichever root created them, e.g. a splash screen's
+        image_cache.clear()
+        self.root = ctk.CTk()
+        self.root.title(title)
+        self.root.geometry(f"{self.root.winfo_screenwidth()}x{self.root.winfo_screenheight()}+0+0")
+        self.screen = None
+
+    def show(self, screen, *args):
+        for widget in self.root.winfo_children():
+            widget.destroy()
+        self.screen = screen(self, *args)
+        return self.screen
+
+    def set_title(self, title):
+        self.root.title(title)
+
+    def run(self):
+        self.root.mainloop()
+
+    def close(self):
+        self.root.destroy()
+
+
+def start(screen, *args, title="Titans Fitness Club"):
+    """Open a window on screen and run it until it's closed"""
+    navigator = Navigator(title)
+    navigator.show(screen, *args)
+    navigator.run()
@@ -0,0 +1,247 @@
+import sys
+import time
+import logging
+from dates import to_ordinal
+
+DATA_FILE = "FitnessTrackerData.txt"
+
+CREDENTIAL_PREFIX = "Full Name: "
+EMAIL_PREFIX = "Email: "
+RECORD_PREFIXES = (CREDENTIAL_PREFIX, EMAIL_PREFIX)
+
+# Column layout of the workout CSV rows written by dashboard.log_workout
+WORKOUT_COLUMNS = 8
+LEGACY_WORKOUT_COLUMNS = 7
+
+
+class Credential:
+    __slots__ = ("name", "email", "password")
+
+    def __init__(self, name, email, password):
+        self.name = name
+        self.email = email
+        self.password = password
+
+    def to_line(self):
+        return f"Full Name: {self.name}, Email: {self.email}, Password: {self.password}"
+
+
+class Goal:
+    __slots__ = ("email", "goal", "focus_areas")
+
+    def __init__(self, email, goal, focus_areas):
+        self.email = email
+        self.goal = goal
+        self.focus_areas = focus_areas
+
+    def to_line(self):
+        return f"Email: {self.email}, Fitness Goal: {self.goal}, Focus Areas: {', '.join(self.focus_areas)}"
+
+
+class Measurement:
+    __slots__ = ("email", "weight", "height", "bmi", "category", "gender", "age", "date")
+
+    def __init__(self, email, weight, height, bmi, category, gender, age, date=None):
+        self.email = email
+        self.weight = weight
+        self.height = height
+        self.bmi = bmi
+        self.category = category
+        self.gender = gender
+        self.age = age
+        # Day number the measurement was taken; lines written before it was recorded have none
+        self.date = to_ordinal(date) if date is not None else None
+
+    def to_line(self):
+        dated = f", Date: {self.date}" if self.date is not None else ""
+        return (
+            f"Email: {self.email}, "
+            f"Weight: {self.weight} kg, "
+            f"Height: {self.height} m, "
+            f"BMI: {self.bmi:.2f}, "
+            f"Category: {self.category}, "
+            f"Gender: {self.gender}, "
+            f"Age: {self.age}{dated} |"
+        )
+
+
+class Workout:
+    __slots__ = ("email", "exercise", "date", "duration", "calories", "weight_loss", "strength", "stamina")
+
+    def __init__(self, email, exercise, date, duration, calories, weight_loss, strength, stamina):
+        self.email = email
+        self.exercise = exercise
+        # Stored as a day number; legacy date strings are converted on the way in
+        self.date = to_ordinal(date)
+        self.duration = duration
+        self.calories = calories
+        self.weight_loss = weight_loss
+        self.strength = strength
+        self.stamina = stamina
+
+    def to_line(self):
+        return (
+            f"{self.email},{self.exercise},{self.date},{self.duration},"
+            f"{self.calories},{self.weight_loss},{self.strength},{self.stamina}"
+        )
+
+
+class ParseStats:
+    """Counters for one pass of the parser"""
+
+    def __init__(self):
+        self.lines = 0
+        self.bytes = 0
+        self.records = 0
+        self.skipped = 0
+        self.started = time.perf_counter()
+        self.finished = None
+
+    @property
+    def seconds(self):
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
+
+    @property
+    def lines_per_second(self):
+        return self.lines / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def mb_per_second(self):
+        return self.bytes / self.seconds / 1e6 if self.seconds > 0 else 0.0
+
+    def summary(self):
+        return (
+            f"{self.records} records from {self.lines} lines ({self.skipped} skipped) "
+            f"in {self.seconds * 1000:.1f} ms: "
+            f"{self.lines_per_second:,.0f} lines/s, {self.mb_per_second:.1f} MB/s"
+        )
+
+
+def workout_metrics(duration):
+    """Placeholder estimates derived from a workout's duration in minutes"""
+    calories_burnt = duration * 5  # Example: 5 calories per minute
+    weight_loss = duration * 0.01  # Example: 0.01 kg per minute
+    strength = duration * 0.1  # Example: strength increases by 0.1 units per minute
+    stamina = duration / 10  # Example: stamina increases with duration
+    return calories_burnt, weight_loss, strength, stamina
+
+
+def to_number(value):
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def parse_workout(fields):
+    """Build a Workout from the columns of a CSV row, or return None"""
+    try:
+        if len(fields) == WORKOUT_COLUMNS:
+            email, exercise, date, duration, calories, weight_loss, strength, stamina = fields
+            return Workout(
+                email, exercise, date, to_number(duration), to_number(calories),
+                float(weight_loss), float(strength), float(stamina)
+            )
+        if len(fields) == LEGACY_WORKOUT_COLUMNS:
+            # Legacy rows stored the member's body weight where weight_loss now
+            # goes and had no strength column, so derive both from the duration
+            email, exercise, date, duration, calories, _, stamina = fields
+            duration = to_number(duration)
+            _, weight_loss, strength, _ = workout_metrics(duration)
+            return Workout(email, exercise, date, duration, to_number(calories), weight_loss, strength, float(stamina))
+    except ValueError:
+        pass
+    return None
+
+
+def parse_credential(line):
+    head, sep, password = line.rpartition(", Password: ")
+    if not sep:
+        return None
+    name, sep, email = head.partition(", Email: ")
+    if not sep:
+        return None
+    return Credential(name[len(CREDENTIAL_PREFIX):], email, password)
+
+
+def parse_email_record(line):
+    """Parse a goal or measurement line, both of which start with "Email: " """
+    email, _, rest = line[len(EMAIL_PREFIX):].partition(", ")
+    if rest.startswith("Fitness Goal: "):
+        goal, _, focus = rest[len("Fitness Goal: "):].partition(", Focus Areas: ")
+        return Goal(email, goal, focus.split(", ") if focus else [])
+
+    if rest.startswith("Weight: "):
+        fields = {}
+        for part in rest.rstrip(" |").split(", "):
+            key, _, value = part.partition(": ")
+            fields[key] = value
+        try:
+            return Measurement(
+                email,
+                float(fields["Weight"].split()[0]),
+                float(fields["Height"].split()[0]),
+                float(fields["BMI"]),
+                fields.get("Category"),
+                fields.get("Gender"),
+                to_number(fields["Age"]),
+                fields.get("Date")
+            )
+        except (KeyError, ValueError, IndexError):
+            return None
+    return None
+
+
+def parse_line(line):
+    """Classify and decode one line of the data file"""
+    line = line.rstrip("\r\n")
+    # Fast path: workout rows are the bulk of the file and never carry a prefix
+    if not line.startswith(RECORD_PREFIXES):
+        return parse_workout(line.split(",")) if line else None
+    if line.startswith(CREDENTIAL_PREFIX):
+        return parse_credential(line)
+    return parse_email_record(line)
+
+
+def parse_records(lines, stats=None):
+    """Yield a typed record for every line that decodes, skipping the rest"""
+    for line in lines:
+        if stats is not None:
+            stats.lines += 1
+            stats.bytes += len(line.encode("utf-8"))
+        record = parse_line(line)
+        if record is None:
+            if stats is not None and line.strip():
+                stats.skipped += 1
+            continue
+        if stats is not None:
+            stats.records += 1
+        yield record
+    if stats is not None:
+        stats.finished = time.perf_counter()
+
+
+def read_records(path=DATA_FILE, stats=None):
+    """Stream the typed records of a data file; yields nothing if it doesn't exist"""
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as file:
+            yield from parse_records(file, stats)
+    except FileNotFoundError:
+        logging.info(f"{path} not found")
+
+
+def main(argv):
+    path = argv[1] if len(argv) > 1 else DATA_FILE
+    stats = ParseStats()
+    counts = {}
+    for record in read_records(path, stats):
+        name = type(record).__name__
+        counts[name] = counts.get(name, 0) + 1
+    for name, count in sorted(counts.items()):
+        print(f"{name}: {count}")
+    print(stats.summary())
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,232 @@
+import os
+import sys
+import json
+import hashlib
+import logging
+from dates import from_ordinal
+from records import DATA_FILE, Workout
+from tail_reader import TailReader
+
+ROLLUP_VERSION = 2
+
+METRICS = ("calories", "duration", "weight_loss", "strength", "stamina")
+PERIODS = ("exercise", "day", "week", "month")
+
+
+def period_keys(workout):
+    """The bucket a workout falls in for each period; every key sorts chronologically as text"""
+    day = from_ordinal(workout.date)
+    year, week, _ = day.isocalendar()
+    return {
+        "exercise": workout.exercise,
+        "day": day.isoformat(),
+        "week": f"{year}-W{week:02d}",
+        "month": f"{day.year}-{day.month:02d}",
+    }
+
+
+class Rollup:
+    """Running totals of one member's workouts per exercise, day, ISO week and month
+
+    Each bucket is [workouts, calories, duration, weight_loss, strength, stamina].
+    """
+
+    def __init__(self, buckets=None):
+        self.buckets = buckets or {period: {} for period in PERIODS}
+
+    def add(self, workout):
+        for period, key in period_keys(workout).items():
+            bucket = self.buckets[period].get(key)
+            if bucket is None:
+                bucket = self.buckets[period][key] = [0] + [0] * len(METRICS)
+            bucket[0] += 1
+            for i, metric in enumerate(METRICS, 1):
+                bucket[i] += getattr(workout, metric)
+
+    def totals(self, period):
+        return {
+            key: dict(zip(("workouts",) + METRICS, bucket))
+            for key, bucket in sorted(self.buckets[period].items())
+        }
+
+
+def member_name(email):
+    """File name of a member's rollup; hashed so emails never reach the file system"""
+    return hashlib.sha256(email.encode()).hexdigest()[:32] + ".json"
+
+
+class StaleRollup(Exception):
+    """A saved member rollup doesn't match the saved state, e.g. after a crash mid-save"""
+
+
+class RollupFile:
+    """Per-member rollups of one data file, saved next to it and caught up from its tail
+
+    <data>.rollup/state.json holds the offset and inode read up to, which
+    work like the UserDirectory index: only workouts appended since are
+    added, and a replaced or truncated file (e.g. after compaction) is
+    summed again from scratch. Each member's buckets are in their own
+    <hash>.json, loaded on first use, and a refresh rewrites only the
+    members it added workouts for. Member files record the offset they
+    were saved at, so one saved ahead of the state is caught and
+    everything summed again rather than counted twice.
+    """
+
+    def __init__(self, data_file=DATA_FILE, directory=None):
+        self.directory = directory or f"{data_file}.rollup"
+        self.state_file = os.path.join(self.directory, "state.json")
+        self.tail = TailReader(data_file)
+        # email -> Rollup, or None for a member with no workouts
+        self.members = {}
+        # Members changed since the last successful save
+        self.unsaved = set()
+        # Offset of the last saved state; no member file may be ahead of it
+        self.saved_offset = 0
+        # Set once the saved member files no longer apply
+        self.rebuilt = False
+        self.load()
+
+    def member_path(self, email):
+        return os.path.join(self.directory, member_name(email))
+
+    def load(self):
+        if os.path.isfile(self.directory):
+            # Left by versions that kept every member in one file
+            try:
+                os.remove(self.directory)
+            except OSError as e:
+                logging.error(f"Error removing old rollups: {e}")
+        try:
+            with open(self.state_file, "r") as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logging.error(f"Error loading rollups, rebuilding: {e}")
+            return
+        if saved.get("version") != ROLLUP_VERSION:
+            return
+        self.tail.offset = self.saved_offset = saved["offset"]
+        self.tail.inode = saved["inode"]
+
+    def load_member(self, email):
+        if self.rebuilt or self.tail.inode is None:
+            return None
+        try:
+            with open(self.member_path(email), "r") as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            raise StaleRollup(f"Error loading rollup for {email}: {e}")
+        if saved.get("inode") != self.tail.inode or saved.get("offset", 0) > self.saved_offset:
+            raise StaleRollup(f"Rollup for {email} doesn't match {self.state_file}")
+        return Rollup(saved["buckets"])
+
+    def member(self, email):
+        if email not in self.members:
+            self.members[email] = self.load_member(email)
+        return self.members[email]
+
+    def write(self, path, saved):
+        tmp_file = f"{path}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(saved, f)
+        os.replace(tmp_file, path)
+
+    def save(self):
+        """Write the changed members, then the state that says how far they go"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for email in list(self.unsaved):
+                self.write(self.member_path(email), {
+                    "email": email,
+                    "inode": self.tail.inode,
+                    "offset": self.tail.offset,
+                    "buckets": self.members[email].buckets
+                })
+                self.unsaved.discard(email)
+            self.write(self.state_file, {
+                "version": ROLLUP_VERSION,
+                "inode": self.tail.inode,
+                "offset": self.tail.offset
+            })
+            self.saved_offset = self.tail.offset
+        except OSError as e:
+            logging.error(f"Error saving rollups: {e}")
+
+    def clear(self):
+        """Forget every member, in memory and on disk, before summing the file again"""
+        self.members = {}
+        self.unsaved = set()
+        self.rebuilt = True
+        try:
+            for name in os.listdir(self.directory):
+                if name != "state.json":
+                    os.remove(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.error(f"Error clearing rollups: {e}")
+
+    def rebuild(self):
+        self.clear()
+        self.tail.offset = 0
+        self.tail.inode = None
+
+    def refresh(self):
+        offset = self.tail.offset
+        records, reset = self.tail.read_new()
+        if reset:
+            self.clear()
+        try:
+            for record in records:
+                if isinstance(record, Workout):
+                    rollup = self.member(record.email)
+                    if rollup is None:
+                        rollup = self.members[record.email] = Rollup()
+                    rollup.add(record)
+                    self.unsaved.add(record.email)
+        except StaleRollup as e:
+            logging.error(f"{e}; rebuilding")
+            self.rebuild()
+            return self.refresh()
+        if reset or self.unsaved or self.tail.offset != offset:
+            self.save()
+        return self
+
+    def totals(self, email, period):
+        try:
+            rollup = self.member(email)
+        except StaleRollup as e:
+            logging.error(f"{e}; rebuilding")
+            self.rebuild()
+            rollup = self.refresh().member(email)
+        return rollup.totals(period) if rollup else {}
+
+    def emails(self):
+        """Every member with saved rollups"""
+        emails = []
+        for name in sorted(os.listdir(self.directory)) if os.path.isdir(self.directory) else []:
+            if name.endswith(".json") and name != "state.json":
+                try:
+                    with open(os.path.join(self.directory, name), "r") as f:
+                        emails.append(json.load(f)["email"])
+                except (OSError, ValueError, KeyError) as e:
+                    logging.error(f"Error reading rollup {name}: {e}")
+        return sorted(emails)
+
+
+def main(argv):
+    path = argv[1] if len(argv) > 1 else DATA_FILE
+    email = argv[2] if len(argv) > 2 else None
+    period = argv[3] if len(argv) > 3 else "exercise"
+    rollups = RollupFile(path).refresh()
+    for member in ([email] if email else rollups.emails()):
+        print(member)
+        for key, totals in rollups.totals(member, period).items():
+            print(f"  {key}: {totals['workouts']} workouts, {totals['calories']} kcal, {totals['duration']} min")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,74 @@
+from collections import OrderedDict
+
+# Built screens kept alive at once, counting the visible one
+SCREEN_POOL_SIZE = 4
+
+
+class ScreenPool:
+    """Built screens kept alive behind the visible one, so going back to one is a re-pack
+
+    Each screen is a packed main_frame on the window. show(name, build)
+    hides the current screen with pack_forget and shows the one pooled
+    under name, or calls build() if there is none; the window title the
+    screen set is restored with it. Past limit screens, the least recently
+    shown are destroyed. invalidate() destroys screens whose data has
+    changed so they are rebuilt next time.
+    """
+
+    def __init__(self, master, limit=SCREEN_POOL_SIZE):
+        self.master = master
+        self.limit = limit
+        self.screens = OrderedDict()
+        self.layouts = {}
+        self.current = None
+
+    def __contains__(self, screen):
+        return any(pooled is screen for pooled in self.screens.values())
+
+    def show(self, name, build):
+        """Show the screen pooled under name, building it with build() if needed"""
+        if self.current is not None and self.current != name:
+            self.hide(self.current)
+
+        screen = self.screens.pop(name, None)
+        if screen is None:
+            screen = build()
+        elif self.current != name:
+            pack_options, title = self.layouts[name]
+            screen.main_frame.pack(**pack_options)
+            screen.main_frame.tkraise()
+            self.master.title(title)
+        self.screens[name] = screen
+        self.current = name
+
+        while len(self.screens) > self.limit:
+            evicted = next(iter(self.screens))
+            self.discard(evicted)
+        return screen
+
+    def hide(self, name):
+        screen = self.screens.get(name)
+        if screen is None:
+            return
+        try:
+            self.layouts[name] = (screen.main_frame.pack_info(), self.master.title())
+            screen.main_frame.pack_forget()
+        except Exception:
+            # Already destroyed; forget it rather than try to show it again
+            self.discard(name)
+
+    def discard(self, name):
+        screen = self.screens.pop(name, None)
+        self.layouts.pop(name, None)
+        if name == self.current:
+            self.current = None
+        if screen is not None:
+            try:
+                screen.destroy()
+            except Exception:
+                pass
+
+    def invalidate(self, *names):
+        """Destroy the named screens (every screen if none are named) so they are rebuilt"""
+        for name in names or list(self.screens):
+            self.discard(name)
@@ -1,24 +1,23 @@
 import customtkinter as ctk
-from PIL import Image
-import subprocess
 import sys
-import measurements
-import welcome
-
-class FitnessTrackerApp(ctk.CTk):
-    def __init__(self, email):
-        super().__init__()
-
+import tkinter.messagebox as tkmb
+from image_cache import get_image
+from navigator import start
+from records import Goal
+from storage import get_repository
+
+class GoalsScreen:
+    def __init__(self, navigator, email):
+        self.navigator = navigator
         self.email = email  
         self.selected_fitness_goal = None  
         self.selected_focus_areas = []  
         self.checkboxes = {}
 
-        self.title("Goal Setting and Focus")
-        self.geometry(f"{self.winfo_screenwidth()}x{self.winfo_screenheight()}+0+0")
+        navigator.set_title("Goal Setting and Focus")
 
         # Create the main frame
-        self.main_frame = ctk.CTkFrame(self, corner_radius=10, fg_color="white")  
+        self.main_frame = ctk.CTkFrame(navigator.root, corner_radius=10, fg_color="white")  
         self.main_frame.pack(pady=20, padx=20, fill="both", expand=True)
 
         self.create_main_menu()
@@ -29,8 +28,7 @@ class FitnessTrackerApp(ctk.CTk):
 
         self.main_frame.configure(fg_color="white")
 
-        back_image = Image.open("img/icons-back.png").resize((30, 30), Image.LANCZOS)
-        self.back_icon = ctk.CTkImage(back_image, size=(30, 30))
+        self.back_icon = get_image("img/icons-back.png", (30, 30))
         back_button = ctk.CTkButton(self.main_frame, image=self.back_icon, text="", command=self.go_to_welcome, width=40)
         back_button.pack(side="top", anchor="nw", padx=10, pady=(10, 0))
 
@@ -57,8 +55,7 @@ class FitnessTrackerApp(ctk.CTk):
 
         self.main_frame.configure(fg_color="white")
 
-        back_image = Image.open("img/icons-back.png").resize((30, 30), Image.LANCZOS)
-        self.back_icon = ctk.CTkImage(back_image, size=(30, 30))
+        self.back_icon = get_image("img/icons-back.png", (30, 30))
         back_button = ctk.CTkButton(self.main_frame, image=self.back_icon, text="", command=self.create_main_menu, width=40)
         back_button.pack(side="top", anchor="nw", padx=10, pady=(10, 0))
 
@@ -83,27 +80,25 @@ class FitnessTrackerApp(ctk.CTk):
 
     def continue_to_next_page(self):
         if self.selected_focus_areas:
-            with open("FitnessTrackerData.txt", "a") as file:
-                file.write(f"Email: {self.email}, Fitness Goal: {self.selected_fitness_goal}, Focus Areas: {', '.join(self.selected_focus_areas)}\n")
+            try:
+                get_repository().add_goal(Goal(self.email, self.selected_fitness_goal, self.selected_focus_areas))
+            except OSError as e:
+                tkmb.showerror("Error", f"Could not save your goals: {e}")
+                return
             
-            # Replace subprocess with direct module import
-            measurements_app = measurements.MeasurementsApp(
-                email=self.email,
-                fitness_goal=self.selected_fitness_goal,
-                focus_areas=self.selected_focus_areas
-            )
-            self.destroy()
-            measurements_app.mainloop()
+            import measurements
+            self.navigator.show(measurements.show_measurements, self.email)
         else:
             print("No focus areas selected.")
 
     def go_to_welcome(self):
-        # Replace subprocess with direct module import
-        welcome_app = welcome.WelcomeApp()
-        self.destroy()
-        welcome_app.mainloop()
+        import welcome
+        self.navigator.show(welcome.show_welcome, self.email)
+
+# Build the goals screen into the navigator's window
+def show_goals(navigator, email):
+    return GoalsScreen(navigator, email)
 
 if __name__ == "__main__":
     user_email = sys.argv[1] if len(sys.argv) > 1 else None  # Handle missing email
-    app = FitnessTrackerApp(email=user_email)
-    app.mainloop()
+    start(show_goals, user_email, title="Goal Setting and Focus")
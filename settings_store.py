@@ -0,0 +1,105 @@
+import os
+import json
+import hashlib
+import logging
+
+SETTINGS_DIRECTORY = "UserSettings"
+LEGACY_SETTINGS_FILE = "user_settings.json"
+
+
+def settings_name(email):
+    """File name of a member's settings; hashed so emails never reach the file system"""
+    return hashlib.sha256(email.encode()).hexdigest()[:32] + ".json"
+
+
+def read_legacy_settings(path=LEGACY_SETTINGS_FILE):
+    """(email, settings) pairs from the old single user_settings.json document"""
+    try:
+        with open(path, "r") as f:
+            all_settings = json.load(f)
+    except (OSError, ValueError) as e:
+        # Older versions could leave this file truncated or with trailing garbage
+        logging.error(f"Error reading legacy settings from {path}: {e}")
+        return []
+    if not isinstance(all_settings, dict):
+        return []
+    # Skip the global keys dashboard.save_settings used to write at the top level
+    return [
+        (email, settings) for email, settings in all_settings.items()
+        if "@" in email and isinstance(settings, dict)
+    ]
+
+
+class SettingsStore:
+    """Per-member key-value settings, one small JSON file each
+
+    Reads are served from memory after the first load of a member, and a
+    change rewrites only that member's file, via a temporary file and an
+    atomic rename, so a crash mid-write leaves the previous copy intact.
+    """
+
+    def __init__(self, directory=SETTINGS_DIRECTORY, import_from=LEGACY_SETTINGS_FILE, fsync=False):
+        self.directory = directory
+        self.fsync = fsync
+        self.cache = {}
+        is_new = not os.path.exists(directory)
+        os.makedirs(directory, exist_ok=True)
+
+        # Split the old whole-file document the first time the directory is created
+        if is_new and import_from and os.path.exists(import_from):
+            count = self.import_file(import_from)
+            logging.info(f"Imported settings for {count} members from {import_from} into {directory}")
+
+    def path_for(self, email):
+        return os.path.join(self.directory, settings_name(email))
+
+    def import_file(self, path):
+        count = 0
+        for email, settings in read_legacy_settings(path):
+            self.write(email, settings)
+            count += 1
+        return count
+
+    def load(self, email):
+        try:
+            with open(self.path_for(email), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            logging.error(f"Error reading settings for {email}: {e}")
+            return None
+
+    def write(self, email, settings):
+        path = self.path_for(email)
+        tmp_file = f"{path}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(settings, f)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+        self.cache[email] = settings
+
+    def get(self, email):
+        """A copy of a member's settings dict, or None if they have none saved"""
+        if email not in self.cache:
+            self.cache[email] = self.load(email)
+        settings = self.cache[email]
+        return dict(settings) if settings is not None else None
+
+    def replace(self, email, settings):
+        self.write(email, dict(settings))
+
+    def update(self, email, changes):
+        """Merge changed keys into a member's settings and return the result"""
+        settings = self.get(email) or {}
+        merged = {**settings, **changes}
+        if merged != settings:
+            self.write(email, merged)
+        return dict(merged)
+
+    def set_defaults(self, email, defaults):
+        """Fill in keys a member doesn't have yet, leaving saved values alone"""
+        settings = self.get(email) or {}
+        return self.update(email, {key: value for key, value in defaults.items() if key not in settings})
@@ -1,12 +1,11 @@
 import customtkinter as ctk
 from PIL import Image, ImageTk
-import subprocess
 import random
 import logging
+from warmup import Task, WarmUp, import_modules, open_data_store
 
 class SplashScreen:
-    def __init__(self, duration=3000, config=None):
-        self.duration = duration
+    def __init__(self, config=None):
         self.config = config or self.load_default_config()
         self.setup_logging()
         self.splash = ctk.CTk()
@@ -44,8 +43,17 @@ class SplashScreen:
         version_label = ctk.CTkLabel(self.splash, text="Version 1.0", font=("Helvetica", 12), text_color="black")
         version_label.place(relx=0.95, rely=0.98, anchor="se")
 
-        # Start loading animation
-        self.load_animation()
+        self.message_label.configure(text=random.choice(self.config["messages"]))
+
+        # The progress bar counts real start-up work; login appears once the data store it checks is ready
+        self.ready = False
+        self.warm_up = WarmUp(self.splash, [
+            Task("Opening your data", open_data_store, on_thread=False, critical=True),
+            Task("Loading login", lambda: import_modules("Login"), on_thread=True, critical=True),
+            Task("Loading charts", lambda: import_modules("charts", "matplotlib.figure", "matplotlib.backends.backend_agg"), on_thread=True, critical=False),
+            Task("Loading calendar", lambda: import_modules("tkcalendar"), on_thread=True, critical=False),
+        ], self.show_progress, self.close)
+        self.warm_up.start()
 
     def setup_logging(self):
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -71,38 +79,25 @@ class SplashScreen:
             logging.error("Logo image not found. Using text instead.")
             self.logo_photo = None
 
-    def load_animation(self, step=0):
-        fitness_messages = [
-            "Stay fit, stay healthy!",
-            "Push your limits!",
-            "Every workout counts!",
-            "Stronger every day!",
-            "Your only limit is you!",
-            "Believe in yourself!",
-            "Commit to be fit!",
-            "Fitness is a journey, not a destination.",
-            "Consistency is key!",
-            "Make every rep count!"
-        ]
-
-        if step < 100:
-            self.progress_bar.set((step + 1) / 100)
-            self.message_label.configure(text=random.choice(fitness_messages))  # Update message using configure
-            self.splash.after(int(self.duration / 100), self.load_animation, step + 1)
-        else:
-            self.close()
+    def show_progress(self, done, total, description):
+        self.progress_bar.set(done / total)
 
     def close(self):
+        # Called from the warm-up's after() callback; login starts once this mainloop has returned
+        self.ready = True
         self.splash.destroy()
+
+    def run(self):
+        self.splash.mainloop()
+        if not self.ready:
+            # The splash was closed before start-up finished
+            return
         try:
             import Login  # Directly import the Login screen
             Login.main()  # Call the main function in the Login.py script
         except ModuleNotFoundError:
             logging.error("Login.py not found. Please check the file name and path.")
 
-    def run(self):
-        self.splash.mainloop()
-
 if __name__ == "__main__":
-    splash_screen = SplashScreen(duration=3000)  # Changed from 9000 to 3000
+    splash_screen = SplashScreen()
     splash_screen.run()
@@ -0,0 +1,753 @@
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import sqlite3
+import logging
+import tempfile
+from append_writer import AppendWriter
+from compact import compact_file
+from dates import to_ordinal
+from settings_store import LEGACY_SETTINGS_FILE, SETTINGS_DIRECTORY, SettingsStore, read_legacy_settings
+from rollups import METRICS, RollupFile, period_keys
+from records import Credential, Goal, Measurement, Workout, read_records, workout_metrics
+from tail_reader import SessionCaches
+from user_directory import UserDirectory
+
+DATA_FILE = "FitnessTrackerData.txt"
+DATABASE_FILE = "FitnessTracker.db"
+WORKOUT_PAGE_SIZE = 50
+SHARD_DIRECTORY = "FitnessTrackerData"
+
+# "sqlite", "flat" or "sharded"; the file backends keep the original text format
+STORAGE_BACKEND = os.environ.get("TITANS_STORAGE", "sqlite")
+# fsync every group commit of the flat-file writer
+FSYNC_WRITES = os.environ.get("TITANS_FSYNC", "0") == "1"
+
+
+class Repository:
+    """Storage interface used by every screen; see FlatFileRepository and SQLiteRepository"""
+
+    def add_user(self, full_name, email, hashed_password):
+        raise NotImplementedError
+
+    def validate_login(self, email, hashed_password):
+        raise NotImplementedError
+
+    def get_user(self, email):
+        """Return {'name', 'email'} for a registered member, or None"""
+        raise NotImplementedError
+
+    def user_exists(self, email):
+        raise NotImplementedError
+
+    def add_goal(self, goal):
+        raise NotImplementedError
+
+    def latest_goal(self, email):
+        raise NotImplementedError
+
+    def add_measurement(self, measurement):
+        raise NotImplementedError
+
+    def get_measurements(self, email):
+        raise NotImplementedError
+
+    def latest_measurement(self, email):
+        measurements = self.get_measurements(email)
+        return measurements[-1] if measurements else None
+
+    def add_workout(self, workout):
+        raise NotImplementedError
+
+    def get_workouts(self, email):
+        """Return a member's workouts in the order they were logged"""
+        raise NotImplementedError
+
+    def get_workouts_between(self, email, start, end):
+        """Return a member's workouts dated start to end inclusive, oldest first"""
+        raise NotImplementedError
+
+    def get_workout_page(self, email, cursor=None, limit=WORKOUT_PAGE_SIZE):
+        """Return (workouts, next_cursor): up to limit workouts, most recently logged first
+
+        Pass the returned cursor back for the following page; it is None
+        once the history is exhausted.
+        """
+        raise NotImplementedError
+
+    def get_workouts_at(self, email, offset, limit=WORKOUT_PAGE_SIZE):
+        """Return up to limit workouts starting offset places from the most recently logged
+
+        For views that jump to any point in the history, which a cursor
+        could only reach by reading every page before it.
+        """
+        raise NotImplementedError
+
+    def count_workouts(self, email):
+        raise NotImplementedError
+
+    def get_totals(self, email, period):
+        """Precomputed workout totals per exercise, day, week or month (see rollups.PERIODS)
+
+        Returns {key: {"workouts": n, "calories": ..., ...}} ordered by key.
+        """
+        raise NotImplementedError
+
+    def get_settings(self, email):
+        """Return a member's settings dict, or None if they have none saved"""
+        raise NotImplementedError
+
+    def save_settings(self, email, settings):
+        """Replace a member's settings dict"""
+        raise NotImplementedError
+
+    def update_settings(self, email, changes):
+        """Merge changed keys into a member's settings and return the result"""
+        settings = {**(self.get_settings(email) or {}), **changes}
+        self.save_settings(email, settings)
+        return settings
+
+    def flush(self):
+        """Make every write so far visible to readers in other processes"""
+        pass
+
+    def warm_up(self):
+        """Load whatever the first login reads, ahead of time (e.g. behind the splash screen)"""
+        pass
+
+    def compact(self):
+        """Drop duplicate records and rebuild indexes; returns a short summary"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class FlatFileRepository(Repository):
+    """The original append-only text file plus a per-member settings directory"""
+
+    def __init__(self, data_file=DATA_FILE, settings_directory=SETTINGS_DIRECTORY,
+                 fsync=FSYNC_WRITES, settings_from=LEGACY_SETTINGS_FILE):
+        self.data_file = data_file
+        self.settings = SettingsStore(settings_directory, settings_from, fsync)
+        self.users = UserDirectory(data_file)
+        # Per-member records, refreshed from the bytes appended since the last read
+        self.sessions = SessionCaches(self.path_for)
+        # Goal, measurement and workout lines are group-committed in the background
+        self.writer = AppendWriter(data_file, fsync=fsync)
+        # Workout totals saved next to each data file, keyed by its path
+        self.rollups = {}
+
+    def path_for(self, email):
+        """The file holding a member's goal, measurement and workout lines"""
+        return self.data_file
+
+    def append_record(self, record):
+        self.writer.append(record.to_line(), self.path_for(record.email))
+
+    def flush(self):
+        self.writer.flush()
+
+    def close(self):
+        self.writer.close()
+        self.users.close()
+
+    def warm_up(self):
+        self.users.refresh()
+
+    def compact(self):
+        self.writer.flush()
+        stats = compact_file(self.data_file, self.writer.write_lock)
+        # The compacted file has a new inode, so this rebuilds the credential index
+        self.users.refresh()
+        return stats.summary()
+
+    def add_user(self, full_name, email, hashed_password):
+        # Credentials are written synchronously so their offset can be indexed,
+        # after anything still queued to keep the file in logging order
+        self.writer.flush()
+        self.users.add_user(full_name, email, hashed_password)
+
+    def validate_login(self, email, hashed_password):
+        return self.users.validate(email, hashed_password)
+
+    def get_user(self, email):
+        return self.users.get_user(email)
+
+    def user_exists(self, email):
+        return self.users.exists(email)
+
+    def add_goal(self, goal):
+        self.append_record(goal)
+
+    def latest_goal(self, email):
+        self.writer.drain()
+        goals = self.sessions.get(email).goals
+        return goals[-1] if goals else None
+
+    def add_measurement(self, measurement):
+        self.append_record(measurement)
+
+    def get_measurements(self, email):
+        self.writer.drain()
+        return list(self.sessions.get(email).measurements)
+
+    def add_workout(self, workout):
+        self.append_record(workout)
+
+    def get_workouts(self, email):
+        self.writer.drain()
+        return list(self.sessions.get(email).workouts)
+
+    def get_workouts_between(self, email, start, end):
+        self.writer.drain()
+        return self.sessions.get(email).by_date.between(to_ordinal(start), to_ordinal(end))
+
+    def get_workout_page(self, email, cursor=None, limit=WORKOUT_PAGE_SIZE):
+        self.writer.drain()
+        workouts = self.sessions.get(email).workouts
+        # The cursor is a position in the cached list, which only ever grows at the end
+        end = len(workouts) if cursor is None else min(cursor, len(workouts))
+        start = max(0, end - limit)
+        return workouts[start:end][::-1], (start if start > 0 else None)
+
+    def get_workouts_at(self, email, offset, limit=WORKOUT_PAGE_SIZE):
+        self.writer.drain()
+        workouts = self.sessions.get(email).workouts
+        end = max(0, len(workouts) - offset)
+        return workouts[max(0, end - limit):end][::-1]
+
+    def count_workouts(self, email):
+        self.writer.drain()
+        return len(self.sessions.get(email).workouts)
+
+    def get_totals(self, email, period):
+        self.writer.drain()
+        path = self.path_for(email)
+        rollups = self.rollups.get(path)
+        if rollups is None:
+            rollups = self.rollups[path] = RollupFile(path)
+        return rollups.refresh().totals(email, period)
+
+    def get_settings(self, email):
+        return self.settings.get(email)
+
+    def save_settings(self, email, settings):
+        self.settings.replace(email, settings)
+
+    def update_settings(self, email, changes):
+        return self.settings.update(email, changes)
+
+
+def shard_name(email):
+    """File name of a member's segment; hashed so emails never reach the file system"""
+    return hashlib.sha256(email.encode()).hexdigest()[:32] + ".txt"
+
+
+class ShardedRepository(FlatFileRepository):
+    """Flat-file layout split per member, so reads only touch that member's own history
+
+    FitnessTrackerData/users.txt holds every credential line and
+    FitnessTrackerData/members/<hash>.txt one member's other records and
+    FitnessTrackerData/settings/<hash>.json their settings.
+    """
+
+    def __init__(self, directory=SHARD_DIRECTORY, fsync=FSYNC_WRITES,
+                 import_from=DATA_FILE, settings_from=LEGACY_SETTINGS_FILE):
+        is_new = not os.path.exists(directory)
+        self.directory = directory
+        self.members_directory = os.path.join(directory, "members")
+        os.makedirs(self.members_directory, exist_ok=True)
+        super().__init__(os.path.join(directory, "users.txt"), os.path.join(directory, "settings"), fsync, settings_from)
+
+        # Split the existing single-file data the first time the layout is created
+        if is_new and import_from and os.path.exists(import_from):
+            count = self.import_records(read_records(import_from))
+            logging.info(f"Imported {count} records from {import_from} into {directory}")
+
+    def path_for(self, email):
+        return os.path.join(self.members_directory, shard_name(email))
+
+    def import_records(self, records):
+        count = 0
+        for record in records:
+            if isinstance(record, Credential):
+                self.writer.append(record.to_line(), self.data_file)
+            else:
+                self.append_record(record)
+            count += 1
+        self.writer.flush()
+        return count
+
+    def compact(self):
+        self.writer.flush()
+        summaries = [compact_file(self.data_file, self.writer.write_lock)]
+        for name in os.listdir(self.members_directory):
+            if name.endswith(".txt"):
+                summaries.append(compact_file(os.path.join(self.members_directory, name), self.writer.write_lock))
+        self.users.refresh()
+        duplicates = sum(stats.duplicates for stats in summaries)
+        return f"{len(summaries)} files compacted, {duplicates} duplicates dropped"
+
+
+# Stored in PRAGMA user_version; see SQLiteRepository.migrate
+SCHEMA_VERSION = 3
+
+# Workout dates are day numbers (dates.to_ordinal) so range queries can use the index
+WORKOUTS_TABLE = """
+CREATE TABLE IF NOT EXISTS workouts (
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL,
+    exercise TEXT NOT NULL,
+    date INTEGER NOT NULL,
+    duration REAL,
+    calories REAL,
+    weight_loss REAL,
+    strength REAL,
+    stamina REAL
+);
+CREATE INDEX IF NOT EXISTS workouts_email ON workouts (email);
+CREATE INDEX IF NOT EXISTS workouts_email_date ON workouts (email, date);
+CREATE INDEX IF NOT EXISTS workouts_email_exercise ON workouts (email, exercise);
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL,
+    name TEXT NOT NULL,
+    password TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS users_email ON users (email);
+
+CREATE TABLE IF NOT EXISTS goals (
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL,
+    goal TEXT,
+    focus_areas TEXT
+);
+CREATE INDEX IF NOT EXISTS goals_email ON goals (email);
+
+CREATE TABLE IF NOT EXISTS measurements (
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL,
+    weight REAL,
+    height REAL,
+    bmi REAL,
+    category TEXT,
+    gender TEXT,
+    age INTEGER,
+    date INTEGER
+);
+CREATE INDEX IF NOT EXISTS measurements_email ON measurements (email);
+""" + WORKOUTS_TABLE + """
+CREATE TABLE IF NOT EXISTS rollups (
+    email TEXT NOT NULL,
+    period TEXT NOT NULL,
+    key TEXT NOT NULL,
+    workouts INTEGER NOT NULL,
+    calories REAL,
+    duration REAL,
+    weight_loss REAL,
+    strength REAL,
+    stamina REAL,
+    PRIMARY KEY (email, period, key)
+);
+
+CREATE TABLE IF NOT EXISTS settings (
+    email TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+# Keep the first copy of every exact duplicate row
+DEDUPLICATE = {
+    "users": "email, name, password",
+    "goals": "email, goal, focus_areas",
+    "measurements": "email, weight, height, bmi, category, gender, age, date",
+    "workouts": "email, exercise, date, duration, calories, weight_loss, strength, stamina",
+}
+
+# Statements are constants so sqlite3's statement cache keeps them prepared
+INSERT_USER = "INSERT INTO users (email, name, password) VALUES (?, ?, ?)"
+SELECT_USER = "SELECT name FROM users WHERE email = ? ORDER BY id LIMIT 1"
+SELECT_LOGIN = "SELECT 1 FROM users WHERE email = ? AND password = ? LIMIT 1"
+INSERT_GOAL = "INSERT INTO goals (email, goal, focus_areas) VALUES (?, ?, ?)"
+SELECT_LATEST_GOAL = "SELECT email, goal, focus_areas FROM goals WHERE email = ? ORDER BY id DESC LIMIT 1"
+INSERT_MEASUREMENT = (
+    "INSERT INTO measurements (email, weight, height, bmi, category, gender, age, date) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+SELECT_MEASUREMENTS = (
+    "SELECT email, weight, height, bmi, category, gender, age, date "
+    "FROM measurements WHERE email = ? ORDER BY id"
+)
+INSERT_WORKOUT = (
+    "INSERT INTO workouts (email, exercise, date, duration, calories, weight_loss, strength, stamina) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+SELECT_WORKOUTS = (
+    "SELECT email, exercise, date, duration, calories, weight_loss, strength, stamina "
+    "FROM workouts WHERE email = ? ORDER BY id"
+)
+SELECT_WORKOUTS_BETWEEN = (
+    "SELECT email, exercise, date, duration, calories, weight_loss, strength, stamina "
+    "FROM workouts WHERE email = ? AND date BETWEEN ? AND ? ORDER BY date, id"
+)
+# Keyset paging on the (email, rowid) index: each page is one index seek
+SELECT_WORKOUT_PAGE = (
+    "SELECT id, email, exercise, date, duration, calories, weight_loss, strength, stamina "
+    "FROM workouts WHERE email = ? AND id < ? ORDER BY id DESC LIMIT ?"
+)
+# OFFSET only steps over entries of the same (email, rowid) index, never the table rows
+SELECT_WORKOUTS_AT = (
+    "SELECT email, exercise, date, duration, calories, weight_loss, strength, stamina "
+    "FROM workouts WHERE email = ? ORDER BY id DESC LIMIT ? OFFSET ?"
+)
+COUNT_WORKOUTS = "SELECT COUNT(*) FROM workouts WHERE email = ?"
+# Rollups are kept in step with workouts inside the same transaction
+UPSERT_ROLLUP = (
+    "INSERT INTO rollups (email, period, key, workouts, calories, duration, weight_loss, strength, stamina) "
+    "VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (email, period, key) DO UPDATE SET "
+    "workouts = workouts + 1, "
+    "calories = calories + excluded.calories, "
+    "duration = duration + excluded.duration, "
+    "weight_loss = weight_loss + excluded.weight_loss, "
+    "strength = strength + excluded.strength, "
+    "stamina = stamina + excluded.stamina"
+)
+SELECT_ROLLUPS = (
+    "SELECT key, workouts, calories, duration, weight_loss, strength, stamina "
+    "FROM rollups WHERE email = ? AND period = ? ORDER BY key"
+)
+SELECT_SETTINGS = "SELECT data FROM settings WHERE email = ?"
+UPSERT_SETTINGS = (
+    "INSERT INTO settings (email, data) VALUES (?, ?) "
+    "ON CONFLICT(email) DO UPDATE SET data = excluded.data"
+)
+
+
+def to_number(value):
+    """SQLite hands REAL columns back as floats; keep whole numbers as ints"""
+    return int(value) if isinstance(value, float) and value.is_integer() else value
+
+
+class SQLiteRepository(Repository):
+    """SQLite database in WAL mode so kiosk processes can read while one writes"""
+
+    def __init__(self, database_file=DATABASE_FILE, import_from=DATA_FILE, settings_from=LEGACY_SETTINGS_FILE):
+        is_new = not os.path.exists(database_file)
+        self.settings_cache = {}
+        self.connection = sqlite3.connect(database_file, timeout=10, cached_statements=64)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.migrate()
+
+        # Carry the existing flat-file data over the first time the database is created
+        if is_new and import_from and os.path.exists(import_from):
+            count = self.import_records(read_records(import_from))
+            logging.info(f"Imported {count} records from {import_from} into {database_file}")
+        if is_new and settings_from and os.path.exists(settings_from):
+            with self.connection:
+                self.connection.executemany(
+                    UPSERT_SETTINGS,
+                    [(email, json.dumps(settings)) for email, settings in read_legacy_settings(settings_from)]
+                )
+
+    def migrate(self):
+        """Bring a database created by an older version up to SCHEMA_VERSION"""
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            self.migrate_workout_dates()
+        if version < 2:
+            self.rebuild_rollups()
+        if version < 3:
+            self.add_measurement_dates()
+        if version < SCHEMA_VERSION:
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def migrate_workout_dates(self):
+        """Version 1: workout dates become INTEGER day numbers instead of calendar strings"""
+        columns = {row[1]: row[2] for row in self.connection.execute("PRAGMA table_info(workouts)")}
+        rows = self.connection.execute(
+            "SELECT id, email, exercise, date, duration, calories, weight_loss, strength, stamina FROM workouts"
+        ).fetchall()
+        migrated = []
+        for row in rows:
+            try:
+                migrated.append(row[:3] + (to_ordinal(str(row[3])),) + row[4:])
+            except ValueError:
+                logging.error(f"Dropping workout {row[0]} with unreadable date {row[3]!r}")
+
+        with self.connection:
+            if columns.get("date") != "INTEGER":
+                # The column affinity has to change too, which SQLite can only do by rebuilding
+                self.connection.execute("ALTER TABLE workouts RENAME TO workouts_old")
+                self.connection.execute("DROP INDEX IF EXISTS workouts_email")
+                self.connection.execute("DROP INDEX IF EXISTS workouts_email_date")
+                self.connection.execute("DROP INDEX IF EXISTS workouts_email_exercise")
+                # executescript would commit mid-migration, so the table is recreated statement by statement
+                for statement in WORKOUTS_TABLE.split(";"):
+                    if statement.strip():
+                        self.connection.execute(statement)
+                self.connection.execute("DROP TABLE workouts_old")
+            self.connection.execute("DELETE FROM workouts")
+            self.connection.executemany(
+                "INSERT INTO workouts (id, email, exercise, date, duration, calories, weight_loss, strength, stamina) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                migrated
+            )
+
+    def rebuild_rollups(self):
+        """Version 2: sum the existing workouts into the rollups table"""
+        with self.connection:
+            self.connection.execute("DELETE FROM rollups")
+            for row in self.connection.execute(
+                "SELECT email, exercise, date, duration, calories, weight_loss, strength, stamina FROM workouts"
+            ).fetchall():
+                self.add_to_rollups(Workout(*row))
+
+    def add_measurement_dates(self):
+        """Version 3: measurements record the day they were taken; older rows stay undated"""
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(measurements)")}
+        if "date" not in columns:
+            with self.connection:
+                self.connection.execute("ALTER TABLE measurements ADD COLUMN date INTEGER")
+
+    def add_to_rollups(self, workout):
+        values = tuple(getattr(workout, metric) for metric in METRICS)
+        self.connection.executemany(
+            UPSERT_ROLLUP,
+            [(workout.email, period, key) + values for period, key in period_keys(workout).items()]
+        )
+
+    def import_records(self, records):
+        count = 0
+        with self.connection:
+            for record in records:
+                if isinstance(record, Credential):
+                    self.connection.execute(INSERT_USER, (record.email, record.name, record.password))
+                elif isinstance(record, Goal):
+                    self.connection.execute(INSERT_GOAL, self.goal_row(record))
+                elif isinstance(record, Measurement):
+                    self.connection.execute(INSERT_MEASUREMENT, self.measurement_row(record))
+                elif isinstance(record, Workout):
+                    self.connection.execute(INSERT_WORKOUT, self.workout_row(record))
+                    self.add_to_rollups(record)
+                else:
+                    continue
+                count += 1
+        return count
+
+    def goal_row(self, goal):
+        return (goal.email, goal.goal, ", ".join(goal.focus_areas))
+
+    def measurement_row(self, m):
+        return (m.email, m.weight, m.height, m.bmi, m.category, m.gender, m.age, m.date)
+
+    def workout_row(self, w):
+        return (w.email, w.exercise, w.date, w.duration, w.calories, w.weight_loss, w.strength, w.stamina)
+
+    def add_user(self, full_name, email, hashed_password):
+        with self.connection:
+            self.connection.execute(INSERT_USER, (email, full_name, hashed_password))
+
+    def validate_login(self, email, hashed_password):
+        return self.connection.execute(SELECT_LOGIN, (email, hashed_password)).fetchone() is not None
+
+    def get_user(self, email):
+        row = self.connection.execute(SELECT_USER, (email,)).fetchone()
+        if row is None:
+            return None
+        return {
+            'name': row[0],
+            'email': email
+        }
+
+    def user_exists(self, email):
+        return self.connection.execute(SELECT_USER, (email,)).fetchone() is not None
+
+    def add_goal(self, goal):
+        with self.connection:
+            self.connection.execute(INSERT_GOAL, self.goal_row(goal))
+
+    def latest_goal(self, email):
+        row = self.connection.execute(SELECT_LATEST_GOAL, (email,)).fetchone()
+        if row is None:
+            return None
+        return Goal(row[0], row[1], row[2].split(", ") if row[2] else [])
+
+    def add_measurement(self, measurement):
+        with self.connection:
+            self.connection.execute(INSERT_MEASUREMENT, self.measurement_row(measurement))
+
+    def get_measurements(self, email):
+        return [Measurement(*row) for row in self.connection.execute(SELECT_MEASUREMENTS, (email,))]
+
+    def add_workout(self, workout):
+        with self.connection:
+            self.connection.execute(INSERT_WORKOUT, self.workout_row(workout))
+            self.add_to_rollups(workout)
+
+    def get_workouts(self, email):
+        return [
+            Workout(e, exercise, date, to_number(duration), to_number(calories), weight_loss, strength, stamina)
+            for e, exercise, date, duration, calories, weight_loss, strength, stamina
+            in self.connection.execute(SELECT_WORKOUTS, (email,))
+        ]
+
+    def get_workouts_between(self, email, start, end):
+        return [
+            Workout(e, exercise, date, to_number(duration), to_number(calories), weight_loss, strength, stamina)
+            for e, exercise, date, duration, calories, weight_loss, strength, stamina
+            in self.connection.execute(SELECT_WORKOUTS_BETWEEN, (email, to_ordinal(start), to_ordinal(end)))
+        ]
+
+    def get_workout_page(self, email, cursor=None, limit=WORKOUT_PAGE_SIZE):
+        # The cursor is the id of the last workout returned
+        rows = self.connection.execute(
+            SELECT_WORKOUT_PAGE, (email, (1 << 63) - 1 if cursor is None else cursor, limit)
+        ).fetchall()
+        workouts = [
+            Workout(e, exercise, date, to_number(duration), to_number(calories), weight_loss, strength, stamina)
+            for _, e, exercise, date, duration, calories, weight_loss, strength, stamina in rows
+        ]
+        return workouts, (rows[-1][0] if len(rows) == limit else None)
+
+    def get_workouts_at(self, email, offset, limit=WORKOUT_PAGE_SIZE):
+        return [
+            Workout(e, exercise, date, to_number(duration), to_number(calories), weight_loss, strength, stamina)
+            for e, exercise, date, duration, calories, weight_loss, strength, stamina
+            in self.connection.execute(SELECT_WORKOUTS_AT, (email, limit, offset))
+        ]
+
+    def count_workouts(self, email):
+        return self.connection.execute(COUNT_WORKOUTS, (email,)).fetchone()[0]
+
+    def get_totals(self, email, period):
+        return {
+            key: dict(zip(("workouts",) + METRICS, (to_number(value) for value in values)))
+            for key, *values in self.connection.execute(SELECT_ROLLUPS, (email, period))
+        }
+
+    def get_settings(self, email):
+        if email not in self.settings_cache:
+            row = self.connection.execute(SELECT_SETTINGS, (email,)).fetchone()
+            self.settings_cache[email] = json.loads(row[0]) if row else None
+        settings = self.settings_cache[email]
+        return dict(settings) if settings is not None else None
+
+    def save_settings(self, email, settings):
+        settings = dict(settings)
+        with self.connection:
+            self.connection.execute(UPSERT_SETTINGS, (email, json.dumps(settings)))
+        self.settings_cache[email] = settings
+
+    def compact(self):
+        removed = 0
+        with self.connection:
+            for table, columns in DEDUPLICATE.items():
+                removed += self.connection.execute(
+                    f"DELETE FROM {table} WHERE id NOT IN "
+                    f"(SELECT MIN(id) FROM {table} GROUP BY {columns})"
+                ).rowcount
+        if removed:
+            # Dropped duplicate workouts were counted in the totals
+            self.rebuild_rollups()
+        self.connection.execute("REINDEX")
+        self.connection.execute("VACUUM")
+        self.connection.execute("ANALYZE")
+        return f"{removed} duplicate rows removed"
+
+    def close(self):
+        self.connection.close()
+
+
+def open_repository(backend=None, directory="."):
+    """Open the configured storage backend over the data files in a directory"""
+    backend = backend or STORAGE_BACKEND
+    if backend == "flat":
+        return FlatFileRepository(
+            os.path.join(directory, DATA_FILE),
+            os.path.join(directory, SETTINGS_DIRECTORY),
+            settings_from=os.path.join(directory, LEGACY_SETTINGS_FILE)
+        )
+    if backend == "sharded":
+        return ShardedRepository(
+            os.path.join(directory, SHARD_DIRECTORY),
+            import_from=os.path.join(directory, DATA_FILE),
+            settings_from=os.path.join(directory, LEGACY_SETTINGS_FILE)
+        )
+    if backend == "sqlite":
+        return SQLiteRepository(
+            os.path.join(directory, DATABASE_FILE),
+            os.path.join(directory, DATA_FILE),
+            os.path.join(directory, LEGACY_SETTINGS_FILE)
+        )
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+repository = None
+
+
+def get_repository():
+    """Return the process-wide repository, opening it on first use"""
+    global repository
+    if repository is None:
+        repository = open_repository()
+    return repository
+
+
+def benchmark(backend, members=200, workouts_per_member=50, lookups=500):
+    """Time registration, workout logging and per-member reads on a scratch copy of a backend"""
+    emails = [f"member{i}@example.com" for i in range(members)]
+    timings = {}
+    with tempfile.TemporaryDirectory() as directory:
+        repo = open_repository(backend, directory)
+
+        start = time.perf_counter()
+        for email in emails:
+            repo.add_user("Member", email, "0" * 64)
+        timings["add_user"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for day in range(workouts_per_member):
+            for email in emails:
+                duration = random.randint(5, 90)
+                repo.add_workout(Workout(email, "Running", f"10/{day % 28 + 1}/24", duration, *workout_metrics(duration)))
+        repo.flush()
+        timings["add_workout"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(lookups):
+            repo.validate_login(random.choice(emails), "0" * 64)
+        timings["validate_login"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(lookups // 10):
+            repo.get_workouts(random.choice(emails))
+        timings["get_workouts"] = time.perf_counter() - start
+
+        repo.close()
+    return timings
+
+
+def main(argv):
+    if len(argv) > 1 and argv[1] == "bench":
+        members = int(argv[2]) if len(argv) > 2 else 200
+        for backend in ("flat", "sharded", "sqlite"):
+            timings = benchmark(backend, members=members)
+            print(backend)
+            for name, seconds in timings.items():
+                print(f"  {name:<16}{seconds * 1000:10.1f} ms")
+    else:
+        print(f"Usage: python {argv[0]} bench [members]")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,100 @@
+import os
+from collections import OrderedDict
+from dates import DateIndex
+from mmap_scan import MappedScanner, member_prefixes
+from records import Goal, Measurement, Workout
+
+
+class TailReader:
+    """Follows an append-only data file, parsing only the bytes added since the last read
+
+    With prefixes, lines that start with none of them are skipped before
+    being decoded (see mmap_scan.MappedScanner).
+    """
+
+    def __init__(self, path, prefixes=None):
+        self.path = path
+        self.prefixes = prefixes
+        self.offset = 0
+        self.inode = None
+        self.size = 0
+
+    def read_new(self):
+        """Return (records, reset); reset means the file was replaced or truncated
+        and the records are a full reload rather than an append"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            reset = self.inode is not None
+            self.offset = self.size = 0
+            self.inode = None
+            return [], reset
+
+        reset = False
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            reset = self.inode is not None
+            self.offset = 0
+            self.inode = stat.st_ino
+
+        self.size = stat.st_size
+        if stat.st_size == self.offset:
+            return [], reset
+
+        with MappedScanner(self.path) as scanner:
+            records = list(scanner.records(self.prefixes, self.offset, stat.st_size))
+            # A half-written last line is left for the next read
+            self.offset = scanner.offset
+        return records, reset
+
+
+class UserRecordCache:
+    """One member's workouts, measurements and goals, kept current from the file tail"""
+
+    def __init__(self, path, email):
+        self.email = email
+        self.tail = TailReader(path, member_prefixes(email))
+        self.workouts = []
+        self.by_date = DateIndex()
+        self.measurements = []
+        self.goals = []
+
+    def refresh(self):
+        records, reset = self.tail.read_new()
+        if reset:
+            self.workouts = []
+            self.by_date = DateIndex()
+            self.measurements = []
+            self.goals = []
+
+        for record in records:
+            if record.email != self.email:
+                continue
+            if isinstance(record, Workout):
+                self.workouts.append(record)
+                self.by_date.add(record.date, record)
+            elif isinstance(record, Measurement):
+                self.measurements.append(record)
+            elif isinstance(record, Goal):
+                self.goals.append(record)
+        return self
+
+
+class SessionCaches:
+    """The UserRecordCache of the most recently active members, oldest evicted first
+
+    path_for maps an email to the file holding that member's records.
+    """
+
+    def __init__(self, path_for, limit=4):
+        self.path_for = path_for
+        self.limit = limit
+        self.caches = OrderedDict()
+
+    def get(self, email):
+        cache = self.caches.pop(email, None)
+        if cache is None:
+            cache = UserRecordCache(self.path_for(email), email)
+        self.caches[email] = cache
+        while len(self.caches) > self.limit:
+            self.caches.popitem(last=False)
+        return cache.refresh()
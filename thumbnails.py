@@ -0,0 +1,193 @@
+import os
+import sys
+import json
+import hashlib
+import logging
+import threading
+from PIL import Image
+from assets import asset_path, packed
+
+THUMBNAIL_DIRECTORY = "ThumbnailCache"
+IMAGE_DIRECTORY = "img"
+APP_NAME = "TitansFitness"
+
+# Sizes the lessons screens draw exercise images at
+LESSON_THUMBNAIL = (200, 200)
+EXERCISE_IMAGE = (400, 300)
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".jfif", ".png", ".gif")
+JPEG_EXTENSIONS = (".jpg", ".jpeg", ".jfif")
+
+
+def user_cache_directory():
+    """The per-user cache directory for this platform"""
+    if sys.platform == "win32":
+        root = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~/AppData/Local")
+    elif sys.platform == "darwin":
+        root = os.path.expanduser("~/Library/Caches")
+    else:
+        root = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(root, APP_NAME, THUMBNAIL_DIRECTORY)
+
+
+def thumbnail_directory():
+    """Where thumbnails are cached, whatever the working directory
+
+    Next to this module when run from source, like assets.base_directory();
+    a frozen build unpacks into a temporary directory, so it uses the
+    per-user cache instead.
+    """
+    if hasattr(sys, "_MEIPASS"):
+        return user_cache_directory()
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), THUMBNAIL_DIRECTORY)
+
+
+def file_digest(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ThumbnailCache:
+    """Pre-resized copies of source images, content-addressed by (source hash, size, format)
+
+    A source's hash is remembered against its mtime and size in
+    sources.json, so the original is only read again when it changes; a
+    changed source hashes differently and simply misses the cache.
+    """
+
+    def __init__(self, directory=None):
+        if directory is None:
+            directory = thumbnail_directory()
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as e:
+            # e.g. a read-only install directory
+            logging.error(f"Cannot use thumbnail cache {directory}, using the user cache: {e}")
+            directory = user_cache_directory()
+            os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.manifest_file = os.path.join(directory, "sources.json")
+        self.sources = {}
+        self.dirty = False
+        # Thumbnails are decoded on worker threads (see lazy_images)
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.manifest_file, "r") as f:
+                self.sources = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logging.error(f"Error loading thumbnail manifest, rehashing sources: {e}")
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp_file = f"{self.manifest_file}.tmp"
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(self.sources, f)
+            os.replace(tmp_file, self.manifest_file)
+            self.dirty = False
+        except OSError as e:
+            logging.error(f"Error saving thumbnail manifest: {e}")
+
+    def source_digest(self, path):
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        known = self.sources.get(key)
+        if known and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+            return known[2]
+        digest = file_digest(path)
+        with self.lock:
+            self.sources[key] = [stat.st_mtime_ns, stat.st_size, digest]
+            self.dirty = True
+            self.save()
+        return digest
+
+    def thumbnail_path(self, digest, size, image_format):
+        width, height = size
+        extension = "jpg" if image_format == "JPEG" else "png"
+        return os.path.join(self.directory, digest[:2], f"{digest}-{width}x{height}.{extension}")
+
+    def get_path(self, path, size):
+        """Path of the cached thumbnail of an image, building it on first use"""
+        # Photos stay JPEG; anything that may carry transparency or palette art is kept as PNG
+        image_format = "JPEG" if path.lower().endswith(JPEG_EXTENSIONS) else "PNG"
+        cached = self.thumbnail_path(self.source_digest(path), size, image_format)
+        if not os.path.exists(cached):
+            self.build(path, size, image_format, cached)
+        return cached
+
+    def get(self, path, size):
+        """The thumbnail of an image as a loaded PIL image"""
+        with Image.open(self.get_path(path, size)) as image:
+            image.load()
+            return image
+
+    def build(self, path, size, image_format, cached):
+        with Image.open(path) as image:
+            if image.format == "JPEG":
+                # Decode at the smallest power-of-two scale that still covers the target size
+                image.draft("RGB", size)
+            image = image.convert("RGB" if image_format == "JPEG" else "RGBA")
+            image = image.resize(size, Image.LANCZOS)
+
+        os.makedirs(os.path.dirname(cached), exist_ok=True)
+        # Per-thread temporary name, since two workers may build the same thumbnail at once
+        tmp_file = f"{cached}.{threading.get_ident()}.tmp"
+        if image_format == "JPEG":
+            image.save(tmp_file, "JPEG", quality=90)
+        else:
+            image.save(tmp_file, "PNG", optimize=True)
+        os.replace(tmp_file, cached)
+
+
+thumbnail_cache = None
+thumbnail_cache_lock = threading.Lock()
+
+
+def get_thumbnail(path, size):
+    """Return a loaded thumbnail of an image, from the asset archive or the process-wide cache"""
+    global thumbnail_cache
+    f = packed(path, size)
+    if f is not None:
+        with f, Image.open(f) as image:
+            image.load()
+            return image
+    with thumbnail_cache_lock:
+        if thumbnail_cache is None:
+            thumbnail_cache = ThumbnailCache()
+    return thumbnail_cache.get(asset_path(path), size)
+
+
+def prebuild(image_directory=IMAGE_DIRECTORY, sizes=(LESSON_THUMBNAIL, EXERCISE_IMAGE), cache=None):
+    """Build every thumbnail the lessons screens use ahead of time"""
+    cache = cache or ThumbnailCache()
+    image_directory = asset_path(image_directory)
+    count = 0
+    for name in sorted(os.listdir(image_directory)):
+        if not name.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        for size in sizes:
+            try:
+                cache.get_path(os.path.join(image_directory, name), size)
+                count += 1
+            except Exception as e:
+                logging.error(f"Error building thumbnail for {name}: {e}")
+    return count
+
+
+def main(argv):
+    image_directory = argv[1] if len(argv) > 1 else IMAGE_DIRECTORY
+    cache = ThumbnailCache()
+    print(f"{prebuild(image_directory, cache=cache)} thumbnails ready in {cache.directory}")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,175 @@
+import os
+import json
+import atexit
+import logging
+from records import Credential, parse_credential
+
+DATA_FILE = "FitnessTrackerData.txt"
+CREDENTIAL_PREFIX = b"Full Name: "
+INDEX_VERSION = 1
+
+# Newly indexed lines held in memory before the index file is rewritten; the
+# rest is written on close. A stale index only means a longer catch-up scan.
+SAVE_AFTER = 256
+
+
+class UserDirectory:
+    """Persistent email -> byte offset index of the credential lines in the data file
+
+    The index file is rewritten every SAVE_AFTER new entries and on
+    close(), not on each registration. It records how far into the data
+    file it got, so whatever an unsaved index missed is picked up by the
+    next refresh.
+    """
+
+    def __init__(self, data_file=DATA_FILE, index_file=None):
+        self.data_file = data_file
+        self.index_file = index_file or os.path.splitext(data_file)[0] + ".idx"
+        self.offsets = {}
+        self.indexed_size = 0
+        self.inode = None
+        self.loaded = False
+        self.dirty = False
+        self.unsaved = 0
+
+    def load(self):
+        """Load the saved index, falling back to an empty one"""
+        self.loaded = True
+        atexit.register(self.close)
+        try:
+            with open(self.index_file, "r") as f:
+                index = json.load(f)
+            if index.get("version") != INDEX_VERSION:
+                return
+            self.offsets = {email: list(offsets) for email, offsets in index["users"].items()}
+            self.indexed_size = index["size"]
+            self.inode = index["inode"]
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logging.error(f"Ignoring corrupt user index {self.index_file}: {e}")
+            self.reset()
+
+    def save(self):
+        """Write the index next to the data file, replacing the old one atomically"""
+        index = {
+            "version": INDEX_VERSION,
+            "inode": self.inode,
+            "size": self.indexed_size,
+            "users": self.offsets
+        }
+        tmp_file = f"{self.index_file}.tmp"
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(index, f)
+            os.replace(tmp_file, self.index_file)
+            self.dirty = False
+            self.unsaved = 0
+        except OSError as e:
+            logging.error(f"Error saving user index: {e}")
+
+    def reset(self):
+        self.offsets = {}
+        self.indexed_size = 0
+        self.inode = None
+        self.dirty = True
+
+    def changed(self, entries):
+        """Note newly indexed entries, saving once enough have built up"""
+        self.dirty = True
+        self.unsaved += entries
+        if self.unsaved >= SAVE_AFTER:
+            self.save()
+
+    def close(self):
+        """Write the index if anything changed since it was last saved"""
+        if self.dirty:
+            self.save()
+
+    def refresh(self):
+        """Bring the index up to date with whatever was appended to the data file"""
+        if not self.loaded:
+            self.load()
+
+        try:
+            stat = os.stat(self.data_file)
+        except FileNotFoundError:
+            if self.offsets or self.indexed_size:
+                self.reset()
+            return
+
+        # A replaced or truncated file invalidates every stored offset
+        if stat.st_ino != self.inode or stat.st_size < self.indexed_size:
+            self.reset()
+            self.inode = stat.st_ino
+
+        if stat.st_size == self.indexed_size:
+            return
+
+        entries = 0
+        with open(self.data_file, "rb") as f:
+            f.seek(self.indexed_size)
+            offset = self.indexed_size
+            for line in f:
+                # Leave a half-written last line for the next refresh
+                if not line.endswith(b"\n"):
+                    break
+                if line.startswith(CREDENTIAL_PREFIX):
+                    credential = parse_credential(line.decode("utf-8", errors="replace").rstrip("\r\n"))
+                    if credential:
+                        self.offsets.setdefault(credential.email, []).append(offset)
+                        entries += 1
+                offset += len(line)
+
+        self.indexed_size = offset
+        self.changed(entries)
+
+    def read_credentials(self, email):
+        """Return every credential record stored for an email"""
+        self.refresh()
+        offsets = self.offsets.get(email)
+        if not offsets:
+            return []
+
+        credentials = []
+        with open(self.data_file, "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                credential = parse_credential(f.readline().decode("utf-8", errors="replace").rstrip("\r\n"))
+                if credential and credential.email == email:
+                    credentials.append(credential)
+        return credentials
+
+    def exists(self, email):
+        self.refresh()
+        return email in self.offsets
+
+    def validate(self, email, hashed_password):
+        return any(c.password == hashed_password for c in self.read_credentials(email))
+
+    def get_user(self, email):
+        credentials = self.read_credentials(email)
+        if not credentials:
+            return None
+        return {
+            'name': credentials[0].name,
+            'email': email
+        }
+
+    def add_user(self, full_name, email, hashed_password):
+        """Append a credential line to the data file and index it"""
+        self.refresh()
+        line = (Credential(full_name, email, hashed_password).to_line() + "\n").encode()
+        with open(self.data_file, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(line)
+
+        # Only index in place if nothing slipped in between refresh and append;
+        # otherwise the next refresh picks the line up with the rest of the tail
+        if offset == self.indexed_size:
+            self.offsets.setdefault(email, []).append(offset)
+            self.indexed_size = offset + len(line)
+            if self.inode is None:
+                self.inode = os.stat(self.data_file).st_ino
+            self.changed(1)
+
@@ -0,0 +1,122 @@
+from collections import OrderedDict
+import customtkinter as ctk
+
+PAGE_SIZE = 50
+# Pages held in memory at once, the least recently shown dropped first
+CACHED_PAGES = 4
+
+
+class VirtualList(ctk.CTkFrame):
+    """Scrollable list that only has widgets for the rows on screen
+
+    Rows come from fetch_rows(offset, limit) -> items, a page at a time as
+    the view reaches them, and only CACHED_PAGES pages are kept, so
+    dragging the scrollbar to the end fetches the last page alone and
+    memory stays flat however long the history. A fixed pool of labels is
+    reconfigured on every scroll instead of creating one widget per item.
+    total is used to size the scrollbar.
+    """
+
+    def __init__(self, master, fetch_rows, total, format_row, row_color=None,
+                 row_height=30, page_size=PAGE_SIZE, empty_text="No workouts recorded.", **kwargs):
+        super().__init__(master, **kwargs)
+        self.fetch_rows = fetch_rows
+        self.total = total
+        self.format_row = format_row
+        self.row_color = row_color
+        self.row_height = row_height
+        self.page_size = page_size
+        self.empty_text = empty_text
+
+        self.pages = OrderedDict()
+        self.first = 0
+        self.rows = []
+
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.body.bind("<Configure>", self.on_resize)
+        for widget in (self, self.body):
+            self.bind_wheel(widget)
+
+    @property
+    def visible(self):
+        return len(self.rows)
+
+    def bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self.on_wheel)
+        # X11 reports the wheel as buttons 4 and 5
+        widget.bind("<Button-4>", lambda event: self.scroll_to(self.first - 3))
+        widget.bind("<Button-5>", lambda event: self.scroll_to(self.first + 3))
+
+    def page(self, number):
+        items = self.pages.pop(number, None)
+        if items is None:
+            items = self.fetch_rows(number * self.page_size, self.page_size)
+            if len(items) < self.page_size:
+                # The count can drift if workouts were logged or compacted meanwhile
+                self.total = min(self.total, number * self.page_size + len(items))
+        self.pages[number] = items
+        while len(self.pages) > CACHED_PAGES:
+            self.pages.popitem(last=False)
+        return items
+
+    def item(self, position):
+        """The item at a position in the list, or None past the end"""
+        if position < 0 or position >= self.total:
+            return None
+        items = self.page(position // self.page_size)
+        index = position % self.page_size
+        return items[index] if index < len(items) else None
+
+    def on_resize(self, event):
+        # CTk multiplies the labels' height by the widget scaling, but the event is in real pixels
+        row_pixels = self.row_height * ctk.ScalingTracker.get_widget_scaling(self)
+        wanted = max(1, int(event.height // row_pixels))
+        while len(self.rows) < wanted:
+            label = ctk.CTkLabel(self.body, text="", anchor="w", height=self.row_height, font=ctk.CTkFont(size=14))
+            label.pack(fill="x", padx=5)
+            self.bind_wheel(label)
+            self.rows.append(label)
+        while len(self.rows) > wanted:
+            self.rows.pop().destroy()
+        self.scroll_to(self.first)
+
+    def on_wheel(self, event):
+        # Windows and macOS report multiples of 120 per notch
+        step = -3 if event.delta > 0 else 3
+        self.scroll_to(self.first + step)
+
+    def on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.scroll_to(int(float(args[0]) * self.total))
+        elif action == "scroll":
+            amount, unit = int(args[0]), args[1]
+            self.scroll_to(self.first + amount * (self.visible if unit == "pages" else 1))
+
+    def scroll_to(self, first):
+        first = max(0, min(first, self.total - self.visible))
+        # Fetching the last row's page can find the history shorter than counted
+        self.item(first + self.visible - 1)
+        self.first = max(0, min(first, self.total - self.visible))
+        self.render()
+
+    def render(self):
+        if not self.total:
+            for index, label in enumerate(self.rows):
+                label.configure(text=self.empty_text if index == 0 else "")
+            self.scrollbar.set(0, 1)
+            return
+
+        for index, label in enumerate(self.rows):
+            item = self.item(self.first + index)
+            if item is not None:
+                label.configure(text=self.format_row(item))
+                if self.row_color is not None:
+                    label.configure(text_color=self.row_color(item))
+            else:
+                label.configure(text="")
+
+        self.scrollbar.set(self.first / self.total, min(1.0, (self.first + self.visible) / self.total))
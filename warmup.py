@@ -0,0 +1,105 @@
+import logging
+import importlib
+import tkinter as tk
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from assets import asset_exists
+from image_cache import image_cache
+from storage import get_repository
+
+POLL_MS = 15
+
+# on_thread tasks must not touch Tk; critical ones hold back on_ready
+Task = namedtuple("Task", "description function on_thread critical")
+
+
+class WarmUp:
+    """Start-up work run behind the splash screen, with progress counted in finished tasks
+
+    Tasks marked on_thread run on a small pool; the rest run one per
+    after() slot on the Tk thread, so the splash keeps repainting between
+    them. on_progress(done, total, description) is called on the Tk thread
+    as each task finishes, and on_ready() as soon as every critical task
+    has, while the others carry on in the background. A failed task is
+    logged and counted as done; warming up must never stop the app starting.
+    """
+
+    def __init__(self, master, tasks, on_progress, on_ready):
+        self.master = master
+        self.tasks = list(tasks)
+        self.on_progress = on_progress
+        self.on_ready = on_ready
+        self.pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="warm-up")
+        self.futures = {}
+        self.foreground = deque()
+        self.pending = set(range(len(self.tasks)))
+        self.done = 0
+        self.ready = False
+
+    def start(self):
+        for number, task in enumerate(self.tasks):
+            if task.on_thread:
+                self.futures[number] = self.pool.submit(task.function)
+            else:
+                self.foreground.append(number)
+        # Let the splash paint before the first foreground task
+        self.master.after(POLL_MS, self.poll)
+
+    def poll(self):
+        try:
+            if self.foreground:
+                number = self.foreground.popleft()
+                try:
+                    self.tasks[number].function()
+                except Exception as e:
+                    logging.error(f"Warm-up task '{self.tasks[number].description}' failed: {e}")
+                self.finish(number)
+
+            for number, future in list(self.futures.items()):
+                if future.done():
+                    del self.futures[number]
+                    if future.exception() is not None:
+                        logging.error(f"Warm-up task '{self.tasks[number].description}' failed: {future.exception()}")
+                    self.finish(number)
+
+            if not self.ready and not any(self.tasks[number].critical for number in self.pending):
+                self.ready = True
+                self.on_ready()
+
+            if self.pending:
+                self.master.after(POLL_MS, self.poll)
+            else:
+                self.pool.shutdown(wait=False)
+        except tk.TclError:
+            # The window went away; thread tasks still run to completion
+            self.pool.shutdown(wait=False)
+
+    def finish(self, number):
+        self.pending.discard(number)
+        self.done += 1
+        self.on_progress(self.done, len(self.tasks), self.tasks[number].description)
+
+
+def open_data_store():
+    """Open the repository and bring the credential index up to date for the first login
+
+    Runs on the Tk thread, since a SQLite connection may only be used by the
+    thread that opened it.
+    """
+    get_repository().warm_up()
+
+
+def import_modules(*names):
+    for name in names:
+        importlib.import_module(name)
+
+
+def warm_images(images):
+    """Decode and resize (path, size) pairs into the shared image cache"""
+    for path, size in images:
+        if not asset_exists(path):
+            continue
+        try:
+            image_cache.get(path, size, "pil")
+        except Exception as e:
+            logging.error(f"Error warming image {path}: {e}")